@@ -4,12 +4,41 @@ The Local Guide System - Main Application
 Advanced AI prototype that understands local culture through product.md context
 """
 
+import atexit
+import os
 import sys
-import json
-from datetime import datetime
-from typing import Dict, Any
 
-from src.local_guide_system import LocalGuideSystem
+# LocalGuideSystem is imported where it is needed so that `help` does not
+# pay for loading the whole guide pipeline
+
+# Interactive-mode query history, kept between sessions
+HISTORY_FILE = os.path.expanduser("~/.local_guide_history")
+
+def _write_lines(lines):
+    """Write a block of output lines to stdout in a single call"""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+def _enable_input_history():
+    """Turn on line editing and persistent query history for interactive mode"""
+    try:
+        import readline
+    except ImportError:
+        # readline is unavailable on some platforms (e.g. Windows); plain input() still works
+        return
+    
+    readline.set_history_length(1000)
+    try:
+        readline.read_history_file(HISTORY_FILE)
+    except OSError:
+        pass
+    
+    def _save_history():
+        try:
+            readline.write_history_file(HISTORY_FILE)
+        except OSError:
+            pass
+    
+    atexit.register(_save_history)
 
 class LocalGuideApp:
     def __init__(self):
@@ -17,6 +46,8 @@ class LocalGuideApp:
         print("🌍 Initializing The Local Guide System...")
         
         try:
+            from src.local_guide_system import LocalGuideSystem
+            
             self.guide_system = LocalGuideSystem()
             status = self.guide_system.get_system_status()
             
@@ -38,6 +69,8 @@ class LocalGuideApp:
     
     def run_interactive_mode(self):
         """Run the system in interactive mode"""
+        _enable_input_history()
+        
         print("🤖 Local Guide is ready! Ask me anything about the city.")
         print("💡 Try queries like:")
         print("   - 'Bhai, where should I eat tonight?'")
@@ -85,85 +118,81 @@ class LocalGuideApp:
     
     def _display_response(self, response):
         """Display the system response in a user-friendly format"""
-        print(f"\n🤖 Local Guide: {response.response_text}")
+        lines = [f"\n🤖 Local Guide: {response.response_text}"]
         
         # Show slang translation if available
         if response.slang_translation and response.slang_translation.slang_words_found:
-            print(f"\n🗣️  Slang Translation:")
+            lines.append(f"\n🗣️  Slang Translation:")
             for slang, meaning in response.slang_translation.slang_words_found:
-                print(f"   '{slang}' → {meaning}")
+                lines.append(f"   '{slang}' → {meaning}")
             
             if response.slang_translation.cultural_context:
-                print(f"   💡 Cultural Context: {response.slang_translation.cultural_context}")
+                lines.append(f"   💡 Cultural Context: {response.slang_translation.cultural_context}")
         
         # Show recommendations if available
         if response.recommendations:
-            print(f"\n💡 Recommendations:")
+            lines.append(f"\n💡 Recommendations:")
             for i, rec in enumerate(response.recommendations[:3], 1):
-                print(f"   {i}. {rec.title}")
-                print(f"      {rec.description}")
+                lines.append(f"   {i}. {rec.title}")
+                lines.append(f"      {rec.description}")
                 if rec.timing_advice:
-                    print(f"      ⏰ {rec.timing_advice}")
+                    lines.append(f"      ⏰ {rec.timing_advice}")
                 if rec.budget_info:
-                    print(f"      💰 {rec.budget_info}")
+                    lines.append(f"      💰 {rec.budget_info}")
         
         # Show confidence level
-        confidence_emoji = {
-            "very_high": "🟢",
-            "high": "🟢", 
-            "medium": "🟡",
-            "low": "🟠",
-            "very_low": "🔴"
-        }
-        
-        confidence_level = response.confidence_score.level.value if hasattr(response.confidence_score.level, 'value') else str(response.confidence_score.level)
-        emoji = confidence_emoji.get(confidence_level, "⚪")
-        print(f"\n{emoji} Confidence: {confidence_level.replace('_', ' ').title()} ({response.confidence_score.overall_score:.2f})")
+        confidence_level = response.confidence_score.level.label
+        emoji = response.confidence_score.level.emoji
+        lines.append(f"\n{emoji} Confidence: {confidence_level.replace('_', ' ').title()} ({response.confidence_score.overall_score:.2f})")
         
         # Show sources used
         if response.sources_used:
-            print(f"📚 Sources: {', '.join(response.sources_used)}")
+            lines.append(f"📚 Sources: {', '.join(response.sources_used)}")
+        
+        _write_lines(lines)
     
     def _handle_debug_query(self, query: str):
         """Handle debug queries to show internal processing"""
-        print(f"\n🔍 Debug Analysis for: '{query}'")
-        print("=" * 40)
+        lines = [f"\n🔍 Debug Analysis for: '{query}'", "=" * 40]
         
         debug_info = self.guide_system.debug_query_processing(query)
         
         if 'error' in debug_info:
-            print(f"❌ {debug_info['error']}")
+            lines.append(f"❌ {debug_info['error']}")
+            _write_lines(lines)
             return
         
         # Query Analysis
-        print("1️⃣ Query Analysis:")
+        lines.append("1️⃣ Query Analysis:")
         analysis = debug_info['query_analysis']
-        print(f"   Intent: {analysis['intent']}")
-        print(f"   Keywords: {analysis['keywords']}")
-        print(f"   Time Context: {analysis['time_context']}")
-        print(f"   Contains Slang: {analysis['contains_slang']}")
+        lines.append(f"   Intent: {analysis['intent']}")
+        lines.append(f"   Keywords: {analysis['keywords']}")
+        lines.append(f"   Time Context: {analysis['time_context']}")
+        lines.append(f"   Contains Slang: {analysis['contains_slang']}")
         
         # Slang Detection
-        print("\n2️⃣ Slang Detection:")
+        lines.append("\n2️⃣ Slang Detection:")
         slang_info = debug_info['slang_detection']
-        print(f"   Mixed Language: {slang_info['is_mixed_language']}")
-        print(f"   Slang Words Found: {slang_info['slang_words']}")
+        lines.append(f"   Mixed Language: {slang_info['is_mixed_language']}")
+        lines.append(f"   Slang Words Found: {slang_info['slang_words']}")
         
         # Context Retrieval
-        print("\n3️⃣ Relevant Context:")
+        lines.append("\n3️⃣ Relevant Context:")
         for i, context in enumerate(debug_info['relevant_context'][:3], 1):
-            print(f"   {i}. Category: {context['category']}")
-            print(f"      Confidence: {context['confidence']:.2f}")
-            print(f"      Source: {context['source']}")
-            print(f"      Preview: {context['content_preview']}")
+            lines.append(f"   {i}. Category: {context['category']}")
+            lines.append(f"      Confidence: {context['confidence']:.2f}")
+            lines.append(f"      Source: {context['source']}")
+            lines.append(f"      Preview: {context['content_preview']}")
         
         # Reasoning Result
-        print("\n4️⃣ Reasoning Result:")
+        lines.append("\n4️⃣ Reasoning Result:")
         reasoning = debug_info['reasoning_result']
-        print(f"   Response: {reasoning['response'][:100]}...")
-        print(f"   Confidence: {reasoning['confidence']:.2f}")
-        print(f"   Sources Used: {reasoning['sources_used']}")
-        print(f"   Missing Info: {reasoning['missing_info']}")
+        lines.append(f"   Response: {reasoning['response'][:100]}...")
+        lines.append(f"   Confidence: {reasoning['confidence']:.2f}")
+        lines.append(f"   Sources Used: {reasoning['sources_used']}")
+        lines.append(f"   Missing Info: {reasoning['missing_info']}")
+        
+        _write_lines(lines)
     
     def _handle_translation(self, text: str):
         """Handle translation requests"""
@@ -201,6 +230,8 @@ def run_sample_queries():
     print("\n🧪 Running Sample Queries...")
     print("=" * 50)
     
+    from src.local_guide_system import LocalGuideSystem
+    
     guide = LocalGuideSystem()
     
     sample_queries = [
@@ -217,17 +248,18 @@ def run_sample_queries():
     ]
     
     for i, query in enumerate(sample_queries, 1):
-        print(f"\n{i}. Query: '{query}'")
-        print("-" * 30)
+        lines = [f"\n{i}. Query: '{query}'", "-" * 30]
         
         response = guide.process_query(query)
-        print(f"Response: {response.response_text}")
+        lines.append(f"Response: {response.response_text}")
         
-        confidence_level = response.confidence_score.level.value if hasattr(response.confidence_score.level, 'value') else str(response.confidence_score.level)
-        print(f"Confidence: {confidence_level} ({response.confidence_score.overall_score:.2f})")
+        confidence_level = response.confidence_score.level.label
+        lines.append(f"Confidence: {confidence_level} ({response.confidence_score.overall_score:.2f})")
         
         if response.slang_translation and response.slang_translation.slang_words_found:
-            print(f"Slang Found: {[word for word, _ in response.slang_translation.slang_words_found]}")
+            lines.append(f"Slang Found: {[word for word, _ in response.slang_translation.slang_words_found]}")
+        
+        _write_lines(lines)
 
 def main():
     """Main entry point"""
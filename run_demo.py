@@ -66,9 +66,8 @@ def main():
             print(f"   🗣️  Slang: {', '.join([f'{w}→{m}' for w, m in response.slang_translation.slang_words_found])}")
         
         # Show confidence
-        confidence_level = response.confidence_score.level.value if hasattr(response.confidence_score.level, 'value') else str(response.confidence_score.level)
-        confidence_emoji = {"very_high": "🟢", "high": "🟢", "medium": "🟡", "low": "🟠", "very_low": "🔴"}
-        emoji = confidence_emoji.get(confidence_level, "⚪")
+        confidence_level = response.confidence_score.level.label
+        emoji = response.confidence_score.level.emoji
         print(f"   {emoji} Confidence: {confidence_level.replace('_', ' ').title()} ({response.confidence_score.overall_score:.2f})")
     
     print(f"\n🎉 Demo completed! The system successfully processed {len(scenarios)} different query types.")
@@ -4,20 +4,146 @@ Computes confidence scores for responses based on available context
 Determines when to ask clarifying questions
 """
 
-from typing import Dict, List, Any, Optional, Tuple
+from bisect import bisect_right
+from typing import Dict, FrozenSet, List, Any, Optional, Set, Tuple
 from dataclasses import dataclass
-from enum import Enum
+from enum import IntEnum
+from operator import attrgetter
 
 from .context_loader import ContextItem, ContextCategory
 
-class ConfidenceLevel(Enum):
-    VERY_LOW = "very_low"      # 0.0 - 0.2
-    LOW = "low"                # 0.2 - 0.4
-    MEDIUM = "medium"          # 0.4 - 0.6
-    HIGH = "high"              # 0.6 - 0.8
-    VERY_HIGH = "very_high"    # 0.8 - 1.0
+class ConfidenceLevel(IntEnum):
+    VERY_LOW = 0               # 0.0 - 0.2
+    LOW = 1                    # 0.2 - 0.4
+    MEDIUM = 2                 # 0.4 - 0.6
+    HIGH = 3                   # 0.6 - 0.8
+    VERY_HIGH = 4              # 0.8 - 1.0
+    
+    @property
+    def label(self) -> str:
+        """Lowercase name used for display and JSON, e.g. 'very_high'"""
+        return self.name.lower()
+    
+    @property
+    def emoji(self) -> str:
+        """Traffic-light emoji shown next to the level by the CLI, demo and web app"""
+        return _LEVEL_EMOJIS[self]
+    
+    @classmethod
+    def from_score(cls, score: float) -> "ConfidenceLevel":
+        """Level whose range contains score"""
+        return _LEVELS[bisect_right(_LEVEL_THRESHOLDS, score)]
+
+# Lower bounds of each level above VERY_LOW, for bisect lookup
+_LEVEL_THRESHOLDS = (0.2, 0.4, 0.6, 0.8)
+_LEVELS = (ConfidenceLevel.VERY_LOW, ConfidenceLevel.LOW, ConfidenceLevel.MEDIUM,
+           ConfidenceLevel.HIGH, ConfidenceLevel.VERY_HIGH)
+
+# Emoji per level, indexed by ConfidenceLevel (VERY_LOW .. VERY_HIGH)
+_LEVEL_EMOJIS = ("🔴", "🟠", "🟡", "🟢", "🟢")
+
+# C-level extractors for the ContextItem fields read in per-item loops
+_get_confidence = attrgetter('confidence')
+_get_category = attrgetter('category')
+
+# Bit flags for factors scoring below 0.5, used by _generate_recommendation
+_WEAK_CONTEXT_AVAILABILITY = 1
+_WEAK_QUERY_SPECIFICITY = 2
+_WEAK_CONTEXT_RELEVANCE = 4
+
+# Missing-information messages, one per category
+_MISSING_INFO = {category: f"{category.value} information" for category in ContextCategory}
+
+# Required information by intent type
+_INTENT_REQUIREMENTS = {
+    'food_recommendation': {
+        'required_categories': frozenset({ContextCategory.FOOD}),
+        'helpful_categories': frozenset({ContextCategory.TIMING, ContextCategory.COST}),
+        'required_fields': ('timings', 'areas')
+    },
+    'transport_query': {
+        'required_categories': frozenset({ContextCategory.TRANSPORT}),
+        'helpful_categories': frozenset({ContextCategory.TIMING, ContextCategory.SAFETY}),
+        'required_fields': ('peak_hours', 'transport_modes')
+    },
+    'slang_translation': {
+        'required_categories': frozenset({ContextCategory.SLANG}),
+        'helpful_categories': frozenset({ContextCategory.CULTURE}),
+        'required_fields': ('slang_dictionary',)
+    },
+    'cultural_advice': {
+        'required_categories': frozenset({ContextCategory.CULTURE}),
+        'helpful_categories': frozenset({ContextCategory.SAFETY}),
+        'required_fields': ('dos', 'donts')
+    }
+}
+
+# Specific clarifying questions by intent
+_CLARIFICATION_TEMPLATES = {
+    'food_recommendation': (
+        "What time are you planning to eat?",
+        "Which area of the city are you in?",
+        "What's your budget range?",
+        "Are you looking for street food or restaurant food?"
+    ),
+    'transport_query': (
+        "Where are you starting from and going to?",
+        "What time do you need to travel?",
+        "Do you prefer train, auto, or bus?",
+        "Are you okay with crowded transport?"
+    ),
+    'slang_translation': (
+        "Which specific words or phrases need translation?",
+        "Are you looking to understand or to speak like a local?"
+    ),
+    'cultural_advice': (
+        "What specific situation or activity are you asking about?",
+        "Are you visiting religious places or general areas?"
+    )
+}
+
+# Words marking the question that best fills each kind of missing information
+_CLARIFICATION_KEYWORDS = {
+    'timing': ('time',),
+    'location': ('where', 'area')
+}
 
-@dataclass
+def _build_clarification_index() -> Dict[str, Dict[str, int]]:
+    """Map each intent and missing-info tag to the index of the first matching question"""
+    index = {}
+    for intent, questions in _CLARIFICATION_TEMPLATES.items():
+        lowered = [q.lower() for q in questions]
+        index[intent] = {
+            tag: next((i for i, q in enumerate(lowered) if any(word in q for word in words)), 0)
+            for tag, words in _CLARIFICATION_KEYWORDS.items()
+        }
+    return index
+
+_CLARIFICATION_INDEX = _build_clarification_index()
+
+@dataclass(frozen=True)
+class _QueryFeatures:
+    """The parts of a query and its analysis that confidence scoring reads"""
+    __slots__ = ('intent', 'word_count', 'has_time_context', 'has_location_context')
+    
+    intent: Optional[str]
+    word_count: int
+    has_time_context: bool
+    has_location_context: bool
+    
+    @classmethod
+    def from_analysis(cls, query: str, analysis: Dict[str, Any]) -> "_QueryFeatures":
+        time_context = analysis.get('time_context') or {}
+        return cls(
+            intent=analysis.get('intent'),
+            word_count=len(query.split()),
+            has_time_context=bool(time_context.get('specific_time') or time_context.get('time_period')),
+            has_location_context=bool(analysis.get('location_context'))
+        )
+
+# Slotted through the decorator rather than a __slots__ tuple, which would
+# clash with the missing_tags default
+@dataclass(frozen=True, slots=True)
 class ConfidenceScore:
     overall_score: float
     level: ConfidenceLevel
@@ -25,8 +151,18 @@ class ConfidenceScore:
     missing_information: List[str]
     recommendation: str
     should_ask_clarification: bool
+    missing_tags: FrozenSet[str] = frozenset()  # category values behind missing_information
 
 class ConfidenceScorer:
+    # Indicators used by _score_response_quality, built once per process
+    _LOCAL_INDICATORS = frozenset({'local', 'mumbai', 'bhai', 'tapri', 'vada pav', 'auto', 'train'})
+    _ACTIONABLE_WORDS = frozenset({'recommend', 'suggest', 'try', 'go to', 'avoid', 'consider'})
+    
+    # Factor names and their weights in the overall score, in matching order
+    _FACTOR_NAMES = ('context_availability', 'query_specificity', 'context_relevance',
+                     'information_completeness', 'response_quality')
+    _FACTOR_WEIGHTS = (0.30, 0.20, 0.25, 0.15, 0.10)
+    
     def __init__(self, confidence_threshold: float = 0.6):
         self.confidence_threshold = confidence_threshold
         
@@ -37,40 +173,55 @@ class ConfidenceScorer:
                            response_content: str) -> ConfidenceScore:
         """Calculate overall confidence score for a response"""
         
-        factors = {}
-        missing_info = []
-        
-        # Factor 1: Context Availability (30% weight)
-        context_score = self._score_context_availability(query, relevant_context)
-        factors['context_availability'] = context_score
+        features = _QueryFeatures.from_analysis(query, query_analysis)
         
         # Factor 2: Query Specificity (20% weight)
-        specificity_score = self._score_query_specificity(query, query_analysis)
-        factors['query_specificity'] = specificity_score
-        
-        # Factor 3: Context Relevance (25% weight)
-        relevance_score = self._score_context_relevance(query, relevant_context)
-        factors['context_relevance'] = relevance_score
-        
-        # Factor 4: Information Completeness (15% weight)
-        completeness_score, missing = self._score_information_completeness(query_analysis, relevant_context)
-        factors['information_completeness'] = completeness_score
-        missing_info.extend(missing)
+        specificity_score = self._score_query_specificity(query, query_analysis, features)
         
         # Factor 5: Response Quality (10% weight)
         response_score = self._score_response_quality(response_content)
-        factors['response_quality'] = response_score
+        
+        if relevant_context:
+            # Features shared across factors: top confidences (1 and 3)
+            # and the set of categories present (3 and 4)
+            top_confidences = list(map(_get_confidence, relevant_context[:3]))
+            available_categories = set(map(_get_category, relevant_context))
+            
+            # Factor 1: Context Availability (30% weight)
+            context_score = self._score_context_availability(query, relevant_context, top_confidences)
+            
+            # Factor 3: Context Relevance (25% weight)
+            relevance_score = self._score_context_relevance(
+                query, relevant_context, top_confidences, available_categories
+            )
+            
+            # Factor 4: Information Completeness (15% weight)
+            completeness_score, missing_info, missing_tags = self._score_information_completeness(
+                query_analysis, relevant_context, available_categories
+            )
+        else:
+            # Without context, factors 1, 3 and 4 are all zero and every
+            # required category for the intent is missing
+            context_score = relevance_score = completeness_score = 0.0
+            req = _INTENT_REQUIREMENTS.get(features.intent)
+            if req is not None:
+                missing_tags = frozenset(cat.value for cat in req['required_categories'])
+                missing_info = [_MISSING_INFO[cat] for cat in req['required_categories']]
+            else:
+                missing_tags = frozenset()
+                missing_info = []
         
         # Calculate weighted overall score
-        weights = {
-            'context_availability': 0.30,
-            'query_specificity': 0.20,
-            'context_relevance': 0.25,
-            'information_completeness': 0.15,
-            'response_quality': 0.10
-        }
+        w_context, w_specificity, w_relevance, w_completeness, w_response = self._FACTOR_WEIGHTS
+        overall_score = (context_score * w_context +
+                         specificity_score * w_specificity +
+                         relevance_score * w_relevance +
+                         completeness_score * w_completeness +
+                         response_score * w_response)
         
-        overall_score = sum(factors[factor] * weights[factor] for factor in factors)
+        factors = dict(zip(self._FACTOR_NAMES, (
+            context_score, specificity_score, relevance_score, completeness_score, response_score
+        )))
         
         # Determine confidence level
         level = self._get_confidence_level(overall_score)
@@ -78,8 +229,17 @@ class ConfidenceScorer:
         # Determine if clarification is needed
         should_ask_clarification = overall_score < self.confidence_threshold
         
+        # Flag the factors whose weakness the recommendation can explain
+        weak_mask = 0
+        if context_score < 0.5:
+            weak_mask |= _WEAK_CONTEXT_AVAILABILITY
+        if specificity_score < 0.5:
+            weak_mask |= _WEAK_QUERY_SPECIFICITY
+        if relevance_score < 0.5:
+            weak_mask |= _WEAK_CONTEXT_RELEVANCE
+        
         # Generate recommendation
-        recommendation = self._generate_recommendation(overall_score, factors, missing_info)
+        recommendation = self._generate_recommendation(overall_score, weak_mask, missing_info)
         
         return ConfidenceScore(
             overall_score=overall_score,
@@ -87,14 +247,19 @@ class ConfidenceScorer:
             factors=factors,
             missing_information=missing_info,
             recommendation=recommendation,
-            should_ask_clarification=should_ask_clarification
+            should_ask_clarification=should_ask_clarification,
+            missing_tags=missing_tags
         )
     
-    def _score_context_availability(self, query: str, context: List[ContextItem]) -> float:
+    def _score_context_availability(self, query: str, context: List[ContextItem],
+                                    top_confidences: Optional[List[float]] = None) -> float:
         """Score based on how much relevant context is available"""
         if not context:
             return 0.0
         
+        if top_confidences is None:
+            top_confidences = list(map(_get_confidence, context[:3]))
+        
         # Base score for having any context
         base_score = 0.3
         
@@ -102,16 +267,20 @@ class ConfidenceScorer:
         context_bonus = min(0.5, len(context) * 0.1)
         
         # Bonus for high-confidence context items
-        confidence_bonus = sum(item.confidence for item in context[:3]) / 3 * 0.2
+        confidence_bonus = sum(top_confidences) / 3 * 0.2
         
         return min(1.0, base_score + context_bonus + confidence_bonus)
     
-    def _score_query_specificity(self, query: str, analysis: Dict[str, Any]) -> float:
+    def _score_query_specificity(self, query: str, analysis: Dict[str, Any],
+                                 features: Optional["_QueryFeatures"] = None) -> float:
         """Score based on how specific and clear the query is"""
+        if features is None:
+            features = _QueryFeatures.from_analysis(query, analysis)
+        
         score = 0.0
         
         # Length factor (not too short, not too long)
-        query_length = len(query.split())
+        query_length = features.word_count
         if 3 <= query_length <= 20:
             score += 0.3
         elif query_length > 20:
@@ -120,81 +289,64 @@ class ConfidenceScorer:
             score += 0.1
         
         # Intent clarity
-        if analysis.get('intent') != 'general_query':
+        if features.intent != 'general_query':
             score += 0.3
         
         # Time context specificity
-        time_context = analysis.get('time_context', {})
-        if time_context.get('specific_time') or time_context.get('time_period'):
+        if features.has_time_context:
             score += 0.2
         
         # Location context specificity
-        if analysis.get('location_context'):
+        if features.has_location_context:
             score += 0.2
         
         return min(1.0, score)
     
-    def _score_context_relevance(self, query: str, context: List[ContextItem]) -> float:
+    def _score_context_relevance(self, query: str, context: List[ContextItem],
+                                 top_confidences: Optional[List[float]] = None,
+                                 available_categories: Optional[Set[ContextCategory]] = None) -> float:
         """Score based on how relevant the context is to the query"""
         if not context:
             return 0.0
         
         # Average relevance of top context items
-        top_context = context[:3]  # Consider top 3 most relevant
-        avg_relevance = sum(item.confidence for item in top_context) / len(top_context)
+        if top_confidences is None:
+            top_confidences = list(map(_get_confidence, context[:3]))  # Consider top 3 most relevant
+        avg_relevance = sum(top_confidences) / len(top_confidences)
         
         # Bonus for having multiple relevant categories
-        categories = set(item.category for item in context)
-        category_bonus = min(0.2, len(categories) * 0.05)
+        if available_categories is None:
+            available_categories = set(map(_get_category, context))
+        category_bonus = min(0.2, len(available_categories) * 0.05)
         
         return min(1.0, avg_relevance + category_bonus)
     
     def _score_information_completeness(self, analysis: Dict[str, Any], 
-                                      context: List[ContextItem]) -> Tuple[float, List[str]]:
+                                      context: List[ContextItem],
+                                      available_categories: Optional[Set[ContextCategory]] = None
+                                      ) -> Tuple[float, List[str], FrozenSet[str]]:
         """Score based on completeness of information for the query type"""
         intent = analysis.get('intent', 'general_query')
         missing_info = []
+        missing_tags = frozenset()
         score = 0.0
         
-        # Required information by intent type
-        requirements = {
-            'food_recommendation': {
-                'required_categories': [ContextCategory.FOOD],
-                'helpful_categories': [ContextCategory.TIMING, ContextCategory.COST],
-                'required_fields': ['timings', 'areas']
-            },
-            'transport_query': {
-                'required_categories': [ContextCategory.TRANSPORT],
-                'helpful_categories': [ContextCategory.TIMING, ContextCategory.SAFETY],
-                'required_fields': ['peak_hours', 'transport_modes']
-            },
-            'slang_translation': {
-                'required_categories': [ContextCategory.SLANG],
-                'helpful_categories': [ContextCategory.CULTURE],
-                'required_fields': ['slang_dictionary']
-            },
-            'cultural_advice': {
-                'required_categories': [ContextCategory.CULTURE],
-                'helpful_categories': [ContextCategory.SAFETY],
-                'required_fields': ['dos', 'donts']
-            }
-        }
-        
-        if intent in requirements:
-            req = requirements[intent]
-            
+        req = _INTENT_REQUIREMENTS.get(intent)
+        if req is not None:
             # Check for required categories
-            available_categories = set(item.category for item in context)
-            required_categories = set(req['required_categories'])
+            if available_categories is None:
+                available_categories = set(map(_get_category, context))
+            required_categories = req['required_categories']
             
             if required_categories.issubset(available_categories):
                 score += 0.6
             else:
                 missing_categories = required_categories - available_categories
-                missing_info.extend([f"{cat.value} information" for cat in missing_categories])
+                missing_tags = frozenset(cat.value for cat in missing_categories)
+                missing_info.extend(_MISSING_INFO[cat] for cat in missing_categories)
             
             # Check for helpful categories
-            helpful_categories = set(req.get('helpful_categories', []))
+            helpful_categories = req['helpful_categories']
             available_helpful = helpful_categories.intersection(available_categories)
             score += len(available_helpful) / len(helpful_categories) * 0.4 if helpful_categories else 0.4
             
@@ -202,17 +354,20 @@ class ConfidenceScorer:
             # General query - score based on any available context
             score = 0.5 if context else 0.0
         
-        return min(1.0, score), missing_info
+        return min(1.0, score), missing_info, missing_tags
     
     def _score_response_quality(self, response: str) -> float:
         """Score the quality of the generated response"""
-        if not response or response.strip() == "":
+        # Lowercase and tokenize once; whitespace splitting is unaffected by case
+        response_lower = response.lower()
+        response_words = response_lower.split()
+        if not response_words:
             return 0.0
         
         score = 0.0
         
         # Length appropriateness
-        response_length = len(response.split())
+        response_length = len(response_words)
         if 10 <= response_length <= 100:
             score += 0.4
         elif response_length > 100:
@@ -221,31 +376,20 @@ class ConfidenceScorer:
             score += 0.2
         
         # Check for specific local information
-        local_indicators = ['local', 'mumbai', 'bhai', 'tapri', 'vada pav', 'auto', 'train']
-        local_mentions = sum(1 for indicator in local_indicators if indicator.lower() in response.lower())
+        local_mentions = sum(1 for indicator in self._LOCAL_INDICATORS if indicator in response_lower)
         score += min(0.3, local_mentions * 0.1)
         
         # Check for actionable advice
-        actionable_words = ['recommend', 'suggest', 'try', 'go to', 'avoid', 'consider']
-        actionable_mentions = sum(1 for word in actionable_words if word.lower() in response.lower())
+        actionable_mentions = sum(1 for word in self._ACTIONABLE_WORDS if word in response_lower)
         score += min(0.3, actionable_mentions * 0.1)
         
         return min(1.0, score)
     
     def _get_confidence_level(self, score: float) -> ConfidenceLevel:
         """Convert numeric score to confidence level"""
-        if score >= 0.8:
-            return ConfidenceLevel.VERY_HIGH
-        elif score >= 0.6:
-            return ConfidenceLevel.HIGH
-        elif score >= 0.4:
-            return ConfidenceLevel.MEDIUM
-        elif score >= 0.2:
-            return ConfidenceLevel.LOW
-        else:
-            return ConfidenceLevel.VERY_LOW
+        return ConfidenceLevel.from_score(score)
     
-    def _generate_recommendation(self, score: float, factors: Dict[str, float], 
+    def _generate_recommendation(self, score: float, weak_mask: int, 
                                missing_info: List[str]) -> str:
         """Generate recommendation based on confidence analysis"""
         
@@ -258,16 +402,13 @@ class ConfidenceScorer:
         elif score >= 0.4:
             recommendations = []
             
-            # Identify weak factors
-            weak_factors = [factor for factor, value in factors.items() if value < 0.5]
-            
-            if 'context_availability' in weak_factors:
+            if weak_mask & _WEAK_CONTEXT_AVAILABILITY:
                 recommendations.append("Need more local context information")
             
-            if 'query_specificity' in weak_factors:
+            if weak_mask & _WEAK_QUERY_SPECIFICITY:
                 recommendations.append("Query could be more specific")
             
-            if 'context_relevance' in weak_factors:
+            if weak_mask & _WEAK_CONTEXT_RELEVANCE:
                 recommendations.append("Available context may not be directly relevant")
             
             if missing_info:
@@ -286,40 +427,17 @@ class ConfidenceScorer:
             return None
         
         intent = query_analysis.get('intent', 'general_query')
-        missing_info = confidence_score.missing_information
-        
-        # Generate specific clarifying questions based on intent and missing info
-        clarification_templates = {
-            'food_recommendation': [
-                "What time are you planning to eat?",
-                "Which area of the city are you in?",
-                "What's your budget range?",
-                "Are you looking for street food or restaurant food?"
-            ],
-            'transport_query': [
-                "Where are you starting from and going to?",
-                "What time do you need to travel?",
-                "Do you prefer train, auto, or bus?",
-                "Are you okay with crowded transport?"
-            ],
-            'slang_translation': [
-                "Which specific words or phrases need translation?",
-                "Are you looking to understand or to speak like a local?"
-            ],
-            'cultural_advice': [
-                "What specific situation or activity are you asking about?",
-                "Are you visiting religious places or general areas?"
-            ]
-        }
+        missing_tags = confidence_score.missing_tags
         
-        if intent in clarification_templates:
+        questions = _CLARIFICATION_TEMPLATES.get(intent)
+        if questions:
             # Select most relevant clarifying question based on missing info
-            questions = clarification_templates[intent]
+            question_index = _CLARIFICATION_INDEX[intent]
             
-            if 'timing' in str(missing_info).lower():
-                return next((q for q in questions if 'time' in q.lower()), questions[0])
-            elif 'location' in str(missing_info).lower():
-                return next((q for q in questions if any(word in q.lower() for word in ['where', 'area'])), questions[0])
+            if 'timing' in missing_tags:
+                return questions[question_index['timing']]
+            elif 'location' in missing_tags:
+                return questions[question_index['location']]
             else:
                 return questions[0]
         
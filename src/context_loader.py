@@ -3,11 +3,77 @@ Context Loader Module
 Parses product.md and converts raw text into structured internal knowledge
 """
 
+import heapq
 import re
-from typing import Dict, List, Any
+from typing import Dict, FrozenSet, List, Any, Optional, Set, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+# Patterns for the product.md subsection formats
+_CITY_NAME_RE = re.compile(r'\*\*City Name:\*\* (.+)')
+_LOCAL_NAME_RE = re.compile(r'\*\*Local Name:\*\* (.+)')
+_DOS_RE = re.compile(r"### Do's\n(.*?)### Don'ts", re.DOTALL)
+_DONTS_RE = re.compile(r"### Don'ts\n(.*?)(?=\n##|\Z)", re.DOTALL)
+_SUBSECTION_RE = re.compile(r'### (.+?)\n(.*?)(?=\n###|\Z)', re.DOTALL)
+
+# Bullet formats, matched with plain string scans (see _scan_bullets)
+_SLANG_ITEM = ('- **', '** - ')         # - **word** - meaning
+_LABELED_ITEM = ('- **', ':** ')        # - **label:** text
+_PRICE_ITEM = ('- ', ': ')              # - item: price
+
+def _scan_bullets(content: str, prefix: str, separator: str) -> List[Tuple[str, str]]:
+    """Find 'prefix key separator value' items without the regex engine.
+    
+    Same results as re.findall(prefix + '(.+?)' + separator + '(.+)', content):
+    at most one item per line, the key ends at the first separator after it,
+    and the value runs to the end of the line.
+    """
+    items = []
+    for line in content.split('\n'):
+        start = line.find(prefix)
+        if start == -1:
+            continue
+        key_start = start + len(prefix)
+        sep = line.find(separator, key_start + 1)
+        value_start = sep + len(separator)
+        if sep != -1 and value_start < len(line):
+            items.append((line[key_start:sep], line[value_start:]))
+    return items
+
+def _scan_quoted_items(content: str) -> List[str]:
+    """Find '- "text"' items, same as re.findall(r'- "(.+?)"', content)"""
+    items = []
+    for line in content.split('\n'):
+        start = line.find('- "')
+        while start != -1:
+            end = line.find('"', start + 4)
+            if end == -1:
+                break
+            items.append(line[start + 3:end])
+            start = line.find('- "', end + 1)
+    return items
+
+def _bullet_lines(text: str) -> List[str]:
+    """Items of a plain '- item' list, with only the bullet marker removed"""
+    return [
+        line.removeprefix('- ')
+        for line in (raw.strip() for raw in text.splitlines())
+        if line.startswith('- ')
+    ]
+
+def _split_food_area(text: str) -> Optional[Tuple[str, str]]:
+    """Split 'foods (timing)' into its parts, same as re.match(r'(.+?) \((.+?)\)', text)"""
+    line_end = text.find('\n')
+    if line_end == -1:
+        line_end = len(text)
+    open_paren = text.find(' (', 1, line_end)
+    if open_paren == -1:
+        return None
+    close_paren = text.find(')', open_paren + 3, line_end)
+    if close_paren == -1:
+        return None
+    return text[:open_paren], text[open_paren + 2:close_paren]
+
 class ContextCategory(Enum):
     SLANG = "slang"
     FOOD = "food"
@@ -19,27 +85,59 @@ class ContextCategory(Enum):
     WEATHER = "weather"
     FESTIVALS = "festivals"
 
+# structured_data sections backing each category, and the reverse lookup
+_CATEGORY_SECTIONS = {
+    ContextCategory.SLANG: ('slang',),
+    ContextCategory.FOOD: ('food',),
+    ContextCategory.TRANSPORT: ('transport',),
+    ContextCategory.CULTURE: ('culture',),
+    ContextCategory.WEATHER: ('weather',),
+    ContextCategory.FESTIVALS: ('festivals',),
+    ContextCategory.COST: ('pricing',),
+    ContextCategory.SAFETY: ('safety',),
+    ContextCategory.TIMING: ('timing_patterns',)
+}
+_SECTION_CATEGORIES = {
+    section: category
+    for category, sections in _CATEGORY_SECTIONS.items()
+    for section in sections
+}
+
 @dataclass
 class ContextItem:
+    __slots__ = ('content', 'category', 'confidence', 'source_section')
+    
     content: str
     category: ContextCategory
     confidence: float
     source_section: str
 
 class ContextLoader:
+    # product.md is read in a single call; a large buffer avoids repeated syscalls
+    _READ_BUFFER_SIZE = 256 * 1024
+    
     def __init__(self, product_md_path: str = "product.md"):
         self.product_md_path = product_md_path
         self.structured_data = {}
         self.raw_content = ""
+        self._search_index: Dict[str, Set[str]] = {}
+        self._section_text: Dict[str, str] = {}
+        self._section_words: Dict[str, FrozenSet[str]] = {}
         
     def load_context(self) -> Dict[str, Any]:
         """Load and parse the product.md file"""
         try:
-            with open(self.product_md_path, 'r', encoding='utf-8') as file:
-                self.raw_content = file.read()
+            # The file is consumed in one go, so read raw bytes and decode once
+            with open(self.product_md_path, 'rb', buffering=self._READ_BUFFER_SIZE) as file:
+                content = file.read().decode('utf-8')
         except FileNotFoundError:
             raise Exception(f"product.md not found at {self.product_md_path}")
         
+        # Keep the universal-newline behaviour of text mode
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        self.raw_content = content
+        
         return self._parse_content()
     
     def _parse_content(self) -> Dict[str, Any]:
@@ -60,25 +158,42 @@ class ContextLoader:
         }
         
         self.structured_data = structured_data
+        self._build_search_index()
         return structured_data
     
+    def _build_search_index(self):
+        """Cache each section's text and word set, and index its lowercase whitespace tokens for search_context"""
+        self._section_text = {name: str(data) for name, data in self.structured_data.items()}
+        self._section_words = {
+            name: frozenset(text.lower().split()) for name, text in self._section_text.items()
+        }
+        
+        index = {}
+        for section_name, words in self._section_words.items():
+            for word in words:
+                index.setdefault(word, set()).add(section_name)
+        self._search_index = index
+    
     def _extract_sections(self) -> Dict[str, str]:
         """Extract sections from markdown"""
+        raw = self.raw_content
         sections = {}
         current_section = None
-        current_content = []
         
-        for line in self.raw_content.split('\n'):
+        # Section bodies are sliced straight out of raw_content by offset
+        section_start = 0
+        line_end = 0
+        for line in raw.split('\n'):
+            line_start = line_end
+            line_end += len(line) + 1
             if line.startswith('## '):
                 if current_section:
-                    sections[current_section] = '\n'.join(current_content)
+                    sections[current_section] = raw[section_start:line_start - 1]
                 current_section = line[3:].strip()
-                current_content = []
-            else:
-                current_content.append(line)
+                section_start = line_end
         
         if current_section:
-            sections[current_section] = '\n'.join(current_content)
+            sections[current_section] = raw[section_start:]
         
         return sections
     
@@ -88,12 +203,12 @@ class ContextLoader:
         if 'City Information' in sections:
             content = sections['City Information']
             # Extract city name
-            city_match = re.search(r'\*\*City Name:\*\* (.+)', content)
+            city_match = _CITY_NAME_RE.search(content)
             if city_match:
                 city_info['name'] = city_match.group(1)
             
             # Extract local name
-            local_match = re.search(r'\*\*Local Name:\*\* (.+)', content)
+            local_match = _LOCAL_NAME_RE.search(content)
             if local_match:
                 city_info['local_name'] = local_match.group(1)
         
@@ -105,7 +220,7 @@ class ContextLoader:
         if 'Common Slang & Phrases' in sections:
             content = sections['Common Slang & Phrases']
             # Match pattern: - **word** - meaning
-            matches = re.findall(r'- \*\*(.+?)\*\* - (.+)', content)
+            matches = _scan_bullets(content, *_SLANG_ITEM)
             for word, meaning in matches:
                 slang_dict[word.lower()] = meaning
         
@@ -122,18 +237,18 @@ class ContextLoader:
         if 'Local Food & Street Vendors' in sections:
             content = sections['Local Food & Street Vendors']
             
-            # Extract timing patterns
-            timing_matches = re.findall(r'- \*\*(.+?):\*\* (.+)', content)
-            for time_period, foods in timing_matches:
-                food_info['timings'][time_period.lower()] = foods
-            
-            # Extract area information
-            area_matches = re.findall(r'- \*\*(.+?):\*\* (.+?) \((.+?)\)', content)
-            for area, foods, timing in area_matches:
-                food_info['areas'][area] = {
-                    'foods': foods,
-                    'timing': timing
-                }
+            # One scan over the labeled bullets: '- **Area:** foods (timing)'
+            # lines are areas, the remaining '- **Period:** foods' are timings
+            for label, text in _scan_bullets(content, *_LABELED_ITEM):
+                area_match = _split_food_area(text)
+                if area_match:
+                    foods, timing = area_match
+                    food_info['areas'][label] = {
+                        'foods': foods,
+                        'timing': timing
+                    }
+                else:
+                    food_info['timings'][label.lower()] = text
         
         return food_info
     
@@ -169,16 +284,16 @@ class ContextLoader:
             content = sections["Cultural Do's and Don'ts"]
             
             # Extract do's
-            dos_section = re.search(r"### Do's\n(.*?)### Don'ts", content, re.DOTALL)
+            dos_section = _DOS_RE.search(content)
             if dos_section:
                 dos_text = dos_section.group(1)
-                culture_info['dos'] = [line.strip('- ') for line in dos_text.split('\n') if line.strip().startswith('-')]
+                culture_info['dos'] = _bullet_lines(dos_text)
             
             # Extract don'ts
-            donts_section = re.search(r"### Don'ts\n(.*?)(?=\n##|\Z)", content, re.DOTALL)
+            donts_section = _DONTS_RE.search(content)
             if donts_section:
                 donts_text = donts_section.group(1)
-                culture_info['donts'] = [line.strip('- ') for line in donts_text.split('\n') if line.strip().startswith('-')]
+                culture_info['donts'] = _bullet_lines(donts_text)
         
         return culture_info
     
@@ -188,7 +303,7 @@ class ContextLoader:
         if 'Weather Patterns' in sections:
             content = sections['Weather Patterns']
             # Extract seasonal information
-            seasons = re.findall(r'### (.+?)\n(.*?)(?=\n###|\Z)', content, re.DOTALL)
+            seasons = _SUBSECTION_RE.findall(content)
             for season, description in seasons:
                 weather_info[season.lower()] = description.strip()
         
@@ -215,10 +330,10 @@ class ContextLoader:
             content = sections['Local Pricing Expectations']
             
             # Extract categories and prices
-            categories = re.findall(r'### (.+?)\n(.*?)(?=\n###|\Z)', content, re.DOTALL)
+            categories = _SUBSECTION_RE.findall(content)
             for category, prices_text in categories:
                 category_prices = {}
-                price_matches = re.findall(r'- (.+?): (.+)', prices_text)
+                price_matches = _scan_bullets(prices_text, *_PRICE_ITEM)
                 for item, price in price_matches:
                     category_prices[item] = price
                 pricing_info[category.lower()] = category_prices
@@ -230,7 +345,7 @@ class ContextLoader:
         safety_info = []
         if 'Safety Notes' in sections:
             content = sections['Safety Notes']
-            safety_matches = re.findall(r'- \*\*(.+?):\*\* (.+)', content)
+            safety_matches = _scan_bullets(content, *_LABELED_ITEM)
             for situation, advice in safety_matches:
                 safety_info.append(f"{situation}: {advice}")
         
@@ -241,7 +356,7 @@ class ContextLoader:
         timing_patterns = {}
         if 'Local Logic Patterns' in sections:
             content = sections['Local Logic Patterns']
-            patterns = re.findall(r'- "(.+?)"', content)
+            patterns = _scan_quoted_items(content)
             for i, pattern in enumerate(patterns):
                 timing_patterns[f'pattern_{i+1}'] = pattern
         
@@ -251,23 +366,10 @@ class ContextLoader:
         """Get all context items for a specific category"""
         items = []
         
-        category_mapping = {
-            ContextCategory.SLANG: ['slang'],
-            ContextCategory.FOOD: ['food'],
-            ContextCategory.TRANSPORT: ['transport'],
-            ContextCategory.CULTURE: ['culture'],
-            ContextCategory.WEATHER: ['weather'],
-            ContextCategory.FESTIVALS: ['festivals'],
-            ContextCategory.COST: ['pricing'],
-            ContextCategory.SAFETY: ['safety'],
-            ContextCategory.TIMING: ['timing_patterns']
-        }
-        
-        for section in category_mapping.get(category, []):
-            if section in self.structured_data:
-                content = self.structured_data[section]
+        for section in _CATEGORY_SECTIONS.get(category, ()):
+            if section in self._section_text:
                 items.append(ContextItem(
-                    content=str(content),
+                    content=self._section_text[section],
                     category=category,
                     confidence=1.0,
                     source_section=section
@@ -275,58 +377,38 @@ class ContextLoader:
         
         return items
     
-    def search_context(self, query: str) -> List[ContextItem]:
-        """Search for relevant context based on query"""
+    def search_context(self, query: str, top_k: int = 10) -> List[ContextItem]:
+        """Search for relevant context based on query, returning the top_k best matches"""
         results = []
-        query_lower = query.lower()
+        query_words = frozenset(query.lower().split())
+        
+        # Sections sharing at least one word with the query
+        matching_sections = set()
+        for word in query_words:
+            matching_sections.update(self._search_index.get(word, ()))
         
         # Search through all structured data
-        for section_name, section_data in self.structured_data.items():
-            if self._contains_relevant_info(str(section_data).lower(), query_lower):
+        for section_name, section_text in self._section_text.items():
+            if section_name in matching_sections:
                 # Determine category based on section name
                 category = self._get_category_from_section(section_name)
                 results.append(ContextItem(
-                    content=str(section_data),
+                    content=section_text,
                     category=category,
-                    confidence=self._calculate_relevance_score(str(section_data).lower(), query_lower),
+                    confidence=self._calculate_relevance_score(section_name, query_words),
                     source_section=section_name
                 ))
         
-        # Sort by confidence score
-        results.sort(key=lambda x: x.confidence, reverse=True)
-        return results
-    
-    def _contains_relevant_info(self, content: str, query: str) -> bool:
-        """Check if content contains relevant information for query"""
-        query_words = query.split()
-        content_words = content.split()
-        
-        # Simple keyword matching - can be improved with NLP
-        matches = sum(1 for word in query_words if word in content_words)
-        return matches > 0
+        # Best matches by confidence score (ties keep section order)
+        return heapq.nlargest(top_k, results, key=lambda x: x.confidence)
     
-    def _calculate_relevance_score(self, content: str, query: str) -> float:
-        """Calculate relevance score between content and query"""
-        query_words = set(query.split())
-        content_words = set(content.split())
-        
+    def _calculate_relevance_score(self, section_name: str, query_words: FrozenSet[str]) -> float:
+        """Fraction of the (lowercase) query words that appear in a section"""
         if not query_words:
             return 0.0
         
-        intersection = query_words.intersection(content_words)
-        return len(intersection) / len(query_words)
+        return len(query_words & self._section_words[section_name]) / len(query_words)
     
     def _get_category_from_section(self, section_name: str) -> ContextCategory:
         """Map section name to context category"""
-        mapping = {
-            'slang': ContextCategory.SLANG,
-            'food': ContextCategory.FOOD,
-            'transport': ContextCategory.TRANSPORT,
-            'culture': ContextCategory.CULTURE,
-            'weather': ContextCategory.WEATHER,
-            'festivals': ContextCategory.FESTIVALS,
-            'pricing': ContextCategory.COST,
-            'safety': ContextCategory.SAFETY,
-            'timing_patterns': ContextCategory.TIMING
-        }
-        return mapping.get(section_name, ContextCategory.CULTURE)
\ No newline at end of file
+        return _SECTION_CATEGORIES.get(section_name, ContextCategory.CULTURE)
\ No newline at end of file
@@ -3,31 +3,48 @@ Main Local Guide System
 Orchestrates all components to provide intelligent local assistance
 """
 
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, replace as dataclass_replace
 from datetime import datetime
 import json
+import threading
 
 from .context_loader import ContextLoader
 from .local_reasoning_engine import LocalReasoningEngine, ReasoningResult
 from .slang_interpreter import SlangInterpreter, SlangTranslation
 from .recommendation_engine import RecommendationEngine, RecommendationRequest, RecommendationType
-from .confidence_scorer import ConfidenceScorer, ConfidenceScore
+from .confidence_scorer import ConfidenceScorer, ConfidenceScore, ConfidenceLevel
 
 @dataclass
 class LocalGuideResponse:
     response_text: str
     confidence_score: ConfidenceScore
     slang_translation: Optional[SlangTranslation] = None
-    recommendations: Optional[List[Any]] = None
+    recommendations: Optional[Tuple[Any, ...]] = None
     cultural_context: Optional[str] = None
-    sources_used: Optional[List[str]] = None
-    reasoning_chain: Optional[List[str]] = None
+    sources_used: Optional[Tuple[str, ...]] = None
+    reasoning_chain: Optional[Tuple[str, ...]] = None
 
 class LocalGuideSystem:
+    # Maximum number of memoized responses kept by process_query
+    _RESPONSE_CACHE_SIZE = 128
+    
+    # Query fragments that mark a question as culturally sensitive
+    _CULTURAL_KEYWORDS = ('wear', 'dress', 'appropriate', 'culture', 'etiquette', 'respect')
+    
+    # Query fragments that ask what a word means, so the slang in it is kept as asked
+    _SLANG_QUESTION_KEYWORDS = ('meaning', 'what does', 'translate')
+    
     def __init__(self, product_md_path: str = "product.md"):
         """Initialize the Local Guide System"""
         
+        self._response_cache: "OrderedDict[tuple, LocalGuideResponse]" = OrderedDict()
+        self._response_cache_source = None
+        self._response_cache_lock = threading.Lock()
+        self._status: Optional[Dict[str, Any]] = None
+        self._status_source = None
+        
         # Initialize core components
         self.context_loader = ContextLoader(product_md_path)
         self.reasoning_engine = LocalReasoningEngine(self.context_loader)
@@ -39,6 +56,14 @@ class LocalGuideSystem:
         try:
             self.context_data = self.context_loader.load_context()
             self.city_name = self.context_data.get('city_info', {}).get('name', 'Unknown City')
+            
+            # Lowercase the do's and don'ts once for explain_cultural_context
+            culture_data = self.context_data.get('culture', {})
+            self._culture_items = [
+                (label, item, item.lower())
+                for key, label in (('dos', 'Do'), ('donts', "Don't"))
+                for item in culture_data.get(key, [])
+            ]
             self.is_initialized = True
         except Exception as e:
             self.is_initialized = False
@@ -52,7 +77,7 @@ class LocalGuideSystem:
                 response_text=f"System initialization failed: {self.initialization_error}",
                 confidence_score=ConfidenceScore(
                     overall_score=0.0,
-                    level="very_low",
+                    level=ConfidenceLevel.VERY_LOW,
                     factors={},
                     missing_information=["product.md file"],
                     recommendation="Check if product.md exists and is properly formatted",
@@ -63,20 +88,70 @@ class LocalGuideSystem:
         if current_time is None:
             current_time = datetime.now()
         
+        # Answers only depend on the hour of current_time, so a repeated query
+        # within the same hour reuses the earlier response. The web app serves
+        # requests on several threads, so the cache is only touched under its lock
+        cache_key = (query, current_time.replace(minute=0, second=0, microsecond=0))
+        with self._response_cache_lock:
+            if self._response_cache_source is not self.context_data:
+                self._response_cache.clear()
+                self._response_cache_source = self.context_data
+            
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                self._response_cache.move_to_end(cache_key)
+                return self._copy_response(cached)
+        
+        response = self._answer_query(query, current_time)
+        
+        with self._response_cache_lock:
+            self._response_cache[cache_key] = response
+            if len(self._response_cache) > self._RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+        
+        return self._copy_response(response)
+    
+    @staticmethod
+    def _copy_response(response: LocalGuideResponse) -> LocalGuideResponse:
+        """Copy of a cached response whose mutable parts the caller can change freely"""
+        confidence_score = response.confidence_score
+        slang_translation = response.slang_translation
+        return dataclass_replace(
+            response,
+            confidence_score=dataclass_replace(
+                confidence_score,
+                factors=dict(confidence_score.factors),
+                missing_information=list(confidence_score.missing_information)
+            ),
+            slang_translation=dataclass_replace(
+                slang_translation,
+                slang_words_found=list(slang_translation.slang_words_found)
+            ) if slang_translation is not None else None,
+            recommendations=tuple(map(dataclass_replace, response.recommendations))
+            if response.recommendations is not None else None
+        )
+    
+    def _answer_query(self, query: str, current_time: datetime) -> LocalGuideResponse:
+        """Run a query through the full slang, reasoning, scoring and recommendation pipeline"""
+        
         # Step 1: Check if query contains slang and translate if needed
         slang_translation = None
         processed_query = query
         
         if self.slang_interpreter.detect_language_mix(query)['is_mixed_language']:
             slang_translation = self.slang_interpreter.interpret_mixed_language(query)
-            processed_query = slang_translation.translated_text
+            # Questions about slang are answered from the words as asked; translated,
+            # the slang they ask about would be gone from the query
+            query_lower = query.lower()
+            if not any(keyword in query_lower for keyword in self._SLANG_QUESTION_KEYWORDS):
+                processed_query = slang_translation.translated_text
         
         # Step 2: Process query through reasoning engine
         reasoning_result = self.reasoning_engine.process_query(processed_query, current_time)
         
         # Step 3: Calculate confidence score
-        query_analysis = self.reasoning_engine._analyze_query(processed_query)
-        relevant_context = self.reasoning_engine._get_relevant_context(processed_query, query_analysis)
+        query_analysis = reasoning_result.query_analysis
+        relevant_context = reasoning_result.relevant_context
         
         confidence_score = self.confidence_scorer.calculate_confidence(
             processed_query, relevant_context, query_analysis, reasoning_result.response
@@ -109,10 +184,11 @@ class LocalGuideSystem:
             response_text=enhanced_response,
             confidence_score=confidence_score,
             slang_translation=slang_translation,
-            recommendations=recommendations,
+            # Tuples, since responses are shared through the response cache
+            recommendations=tuple(recommendations) if recommendations else None,
             cultural_context=cultural_context,
-            sources_used=reasoning_result.sources_used,
-            reasoning_chain=reasoning_result.reasoning_chain
+            sources_used=tuple(reasoning_result.sources_used or ()),
+            reasoning_chain=tuple(reasoning_result.reasoning_chain or ())
         )
     
     def translate_slang(self, text: str, direction: str = "to_standard") -> SlangTranslation:
@@ -147,21 +223,13 @@ class LocalGuideSystem:
         if 'culture' not in self.context_data:
             return "Cultural information is not present in the local context file."
         
-        culture_data = self.context_data['culture']
-        
         # Search for relevant cultural information
-        topic_lower = topic.lower()
-        explanations = []
-        
-        if 'dos' in culture_data:
-            for do_item in culture_data['dos']:
-                if any(word in do_item.lower() for word in topic_lower.split()):
-                    explanations.append(f"Do: {do_item}")
-        
-        if 'donts' in culture_data:
-            for dont_item in culture_data['donts']:
-                if any(word in dont_item.lower() for word in topic_lower.split()):
-                    explanations.append(f"Don't: {dont_item}")
+        topic_words = topic.lower().split()
+        explanations = [
+            f"{label}: {item}"
+            for label, item, item_lower in self._culture_items
+            if any(word in item_lower for word in topic_words)
+        ]
         
         if explanations:
             return f"Cultural context for '{topic}':\n" + "\n".join(explanations)
@@ -171,6 +239,10 @@ class LocalGuideSystem:
     def get_system_status(self) -> Dict[str, Any]:
         """Get system status and loaded context information"""
         
+        # The counts only change when new context is loaded; hand out copies of the snapshot
+        if self.is_initialized and self._status_source is self.context_data:
+            return {**self._status, 'context_sections_loaded': list(self._status['context_sections_loaded'])}
+        
         status = {
             'initialized': self.is_initialized,
             'city_name': getattr(self, 'city_name', 'Unknown'),
@@ -181,6 +253,9 @@ class LocalGuideSystem:
         
         if not self.is_initialized:
             status['error'] = getattr(self, 'initialization_error', 'Unknown error')
+        else:
+            self._status = {**status, 'context_sections_loaded': list(status['context_sections_loaded'])}
+            self._status_source = self.context_data
         
         return status
     
@@ -228,8 +303,8 @@ class LocalGuideSystem:
             return slang_translation.cultural_context
         
         # Check if query relates to cultural topics
-        cultural_keywords = ['wear', 'dress', 'appropriate', 'culture', 'etiquette', 'respect']
-        if any(keyword in original_query.lower() for keyword in cultural_keywords):
+        query_lower = original_query.lower()
+        if any(keyword in query_lower for keyword in self._CULTURAL_KEYWORDS):
             return "Cultural sensitivity is important in local interactions. Check local customs and dress codes."
         
         return None
@@ -278,8 +353,11 @@ class LocalGuideSystem:
         # Step-by-step processing for debugging
         debug_info = {}
         
+        # The reasoning pass also yields the analysis and context it used
+        reasoning_result = self.reasoning_engine.process_query(query)
+        
         # 1. Query analysis
-        query_analysis = self.reasoning_engine._analyze_query(query)
+        query_analysis = reasoning_result.query_analysis
         debug_info['query_analysis'] = query_analysis
         
         # 2. Slang detection
@@ -287,7 +365,7 @@ class LocalGuideSystem:
         debug_info['slang_detection'] = slang_detection
         
         # 3. Context retrieval
-        relevant_context = self.reasoning_engine._get_relevant_context(query, query_analysis)
+        relevant_context = reasoning_result.relevant_context
         debug_info['relevant_context'] = [
             {
                 'category': item.category.value,
@@ -299,7 +377,6 @@ class LocalGuideSystem:
         ]
         
         # 4. Reasoning process
-        reasoning_result = self.reasoning_engine.process_query(query)
         debug_info['reasoning_result'] = {
             'response': reasoning_result.response,
             'confidence': reasoning_result.confidence,
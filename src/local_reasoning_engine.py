@@ -4,13 +4,92 @@ Uses context-based inference, not global rules
 Applies local logic patterns from product.md
 """
 
+from collections import OrderedDict
 from typing import Dict, List, Any, Tuple, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, replace as dataclass_replace
 from datetime import datetime, time
+from functools import lru_cache
+from operator import attrgetter
+import ast
+import heapq
 import re
+import threading
 
 from .context_loader import ContextLoader, ContextCategory, ContextItem
 
+# Query tokenisation and clock-time patterns used by _analyze_query
+_WORD_RE = re.compile(r'\b\w+\b')
+_TIME_PATTERNS = (
+    re.compile(r'(\d{1,2}):(\d{2})\s*(am|pm)?'),
+    re.compile(r'(\d{1,2})\s*(am|pm)'),
+)
+
+# Time period for each hour of the day
+_HOUR_TO_PERIOD = ('night',) * 6 + ('morning',) * 4 + ('afternoon',) * 5 + ('evening',) * 5 + ('night',) * 4
+
+@lru_cache(maxsize=64)
+def _parse_section_text(content: str) -> Any:
+    """Turn a section string from the context loader back into its data, once per string"""
+    return ast.literal_eval(content)
+
+@dataclass(frozen=True)
+class FoodContext:
+    """Food section as read by the food reasoner; None marks a missing key"""
+    __slots__ = ('timings', 'areas', 'hygiene_tips')
+    
+    timings: Optional[Dict[str, str]]
+    areas: Optional[Dict[str, Dict[str, str]]]
+    hygiene_tips: Optional[List[str]]
+    
+    @classmethod
+    def from_data(cls, data: Any) -> "FoodContext":
+        data = data if isinstance(data, dict) else {}
+        return cls(data.get('timings'), data.get('areas'), data.get('hygiene_tips'))
+
+@dataclass(frozen=True)
+class SlangContext:
+    """Slang section as read by the slang reasoner"""
+    __slots__ = ('meanings',)
+    
+    meanings: Dict[str, str]
+    
+    @classmethod
+    def from_data(cls, data: Any) -> "SlangContext":
+        return cls(data if isinstance(data, dict) else {})
+
+@dataclass(frozen=True)
+class CultureContext:
+    """Cultural section as read by the cultural reasoner; None marks a missing key.
+    
+    Each do is paired with its lowercase text and each don't with its lowercase words,
+    so matching a query doesn't re-lowercase and re-split the items.
+    """
+    __slots__ = ('dos', 'donts')
+    
+    dos: Optional[Tuple[Tuple[str, str], ...]]
+    donts: Optional[Tuple[Tuple[str, Tuple[str, ...]], ...]]
+    
+    @classmethod
+    def from_data(cls, data: Any) -> "CultureContext":
+        data = data if isinstance(data, dict) else {}
+        dos = data.get('dos')
+        donts = data.get('donts')
+        return cls(
+            tuple((item, item.lower()) for item in dos) if dos is not None else None,
+            tuple((item, tuple(item.lower().split())) for item in donts) if donts is not None else None
+        )
+
+@lru_cache(maxsize=64)
+def _parse_typed_context(content: str, context_type: type) -> Any:
+    """Typed view of a section string, built once per string and type"""
+    return context_type.from_data(_parse_section_text(content))
+
+def _typed_context(item: ContextItem, context_type: type) -> Any:
+    """Typed view of the structured data behind a context item"""
+    if isinstance(item.content, str):
+        return _parse_typed_context(item.content, context_type)
+    return context_type.from_data(item.content)
+
 @dataclass
 class ReasoningResult:
     response: str
@@ -18,16 +97,96 @@ class ReasoningResult:
     sources_used: List[str]
     reasoning_chain: List[str]
     missing_info: List[str]
+    query_analysis: Optional[Dict[str, Any]] = None
+    relevant_context: Optional[List[ContextItem]] = None
 
 class LocalReasoningEngine:
+    # Intent keywords, checked as substrings in this priority order
+    _INTENT_PATTERNS = {
+        'food_recommendation': ('eat', 'food', 'hungry', 'restaurant', 'street food', 'vada pav', 'bhel'),
+        'transport_query': ('reach', 'go to', 'travel', 'auto', 'train', 'bus', 'traffic', 'commute'),
+        'slang_translation': ('meaning', 'what does', 'translate', 'bhai', 'scene'),
+        'cultural_advice': ('wear', 'appropriate', 'etiquette', 'culture', 'okay to'),
+        'timing_query': ('when', 'time', 'hours', 'open', 'close', 'peak'),
+        'weather_query': ('weather', 'rain', 'monsoon', 'hot', 'cold'),
+        'festival_query': ('festival', 'celebration', 'ganesh', 'diwali', 'navratri'),
+        'safety_query': ('safe', 'danger', 'avoid', 'careful', 'security'),
+        'pricing_query': ('cost', 'price', 'expensive', 'cheap', 'budget')
+    }
+    
+    # Context category fetched up front for each intent
+    _INTENT_CATEGORIES = {
+        'food_recommendation': ContextCategory.FOOD,
+        'transport_query': ContextCategory.TRANSPORT,
+        'slang_translation': ContextCategory.SLANG,
+        'cultural_advice': ContextCategory.CULTURE,
+        'timing_query': ContextCategory.TIMING,
+        'weather_query': ContextCategory.WEATHER,
+        'festival_query': ContextCategory.FESTIVALS,
+        'safety_query': ContextCategory.SAFETY,
+        'pricing_query': ContextCategory.COST
+    }
+    
+    _STOP_WORDS = frozenset({'the', 'is', 'at', 'which', 'on', 'a', 'an', 'and', 'or', 'but', 'in', 'with', 'to', 'for', 'of', 'as', 'by'})
+    
+    _TIME_PERIODS = {
+        'morning': ('morning', 'am', 'breakfast'),
+        'afternoon': ('afternoon', 'lunch', 'noon'),
+        'evening': ('evening', 'dinner', 'night'),
+        'late_night': ('late night', 'midnight', 'late')
+    }
+    
+    _RELATIVE_TIMES = ('now', 'today', 'tonight', 'tomorrow', 'later', 'soon')
+    
+    # Query fragments that make the clothing guidance among the do's relevant
+    _CLOTHING_KEYWORDS = ('wear', 'dress', 'clothes', 'shorts')
+    
+    # Maximum number of reasoning results kept by process_query
+    _CACHE_SIZE = 256
+    
     def __init__(self, context_loader: ContextLoader):
         self.context_loader = context_loader
         self.confidence_threshold = 0.6
+        self._result_cache: "OrderedDict[Tuple[str, int], ReasoningResult]" = OrderedDict()
+        self._cache_source = None
+        self._result_cache_lock = threading.Lock()
+        self._area_names: Tuple[Tuple[str, str], ...] = ()
+        self._slang_words: Tuple[str, ...] = ()
+        self._has_post_7pm_jam = False
+    
+    def _refresh_context_cache(self):
+        """Drop cached results and rebuild the area/slang lookups when the loaded context changes"""
+        context_data = self.context_loader.structured_data
+        if self._cache_source is context_data:
+            return
+        
+        with self._result_cache_lock:
+            self._result_cache.clear()
+        self._cache_source = context_data
+        
+        # (name, lowercase name) pairs, in product.md order
+        areas = context_data.get('food', {}).get('areas', {})
+        self._area_names = tuple((area, area.lower()) for area in areas)
+        self._slang_words = tuple(context_data.get('slang', {}))
+        # Lowercased once here rather than on every transport query
+        timing_text = str(context_data.get('timing_patterns', '')).lower()
+        self._has_post_7pm_jam = "after 7 pm roads are jammed" in timing_text
         
     def process_query(self, query: str, current_time: Optional[datetime] = None) -> ReasoningResult:
         """Process user query using local context and reasoning"""
         if current_time is None:
             current_time = datetime.now()
+        
+        # Reasoning is case-insensitive and only looks at the hour
+        self._refresh_context_cache()
+        
+        # Callers may be on different threads, so the cache is only touched under its lock
+        cache_key = (query.strip().lower(), current_time.hour)
+        with self._result_cache_lock:
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                self._result_cache.move_to_end(cache_key)
+                return self._copy_result(cached)
             
         # Step 1: Analyze query intent and extract key information
         query_analysis = self._analyze_query(query)
@@ -40,15 +199,46 @@ class LocalReasoningEngine:
             query, query_analysis, relevant_context, current_time
         )
         
+        # Hand back the intermediate steps so callers don't redo them
+        reasoning_result.query_analysis = query_analysis
+        reasoning_result.relevant_context = relevant_context
+        
+        # Answers with gaps are not kept, so they get recomputed next time. The cache
+        # keeps its own copy so callers can change the result they are handed
+        if not reasoning_result.missing_info:
+            cached = self._copy_result(reasoning_result)
+            with self._result_cache_lock:
+                self._result_cache[cache_key] = cached
+                if len(self._result_cache) > self._CACHE_SIZE:
+                    self._result_cache.popitem(last=False)
+        
         return reasoning_result
     
+    @staticmethod
+    def _copy_result(result: ReasoningResult) -> ReasoningResult:
+        """Copy of a result whose lists and query analysis the caller can change freely"""
+        query_analysis = result.query_analysis
+        return dataclass_replace(
+            result,
+            sources_used=list(result.sources_used),
+            reasoning_chain=list(result.reasoning_chain),
+            missing_info=list(result.missing_info),
+            query_analysis={
+                key: value.copy() if isinstance(value, (list, dict)) else value
+                for key, value in query_analysis.items()
+            } if query_analysis is not None else None,
+            relevant_context=list(result.relevant_context)
+            if result.relevant_context is not None else None
+        )
+    
     def _analyze_query(self, query: str) -> Dict[str, Any]:
         """Analyze query to understand intent and extract key information"""
         query_lower = query.lower()
+        tokens = _WORD_RE.findall(query_lower)
         
         analysis = {
             'intent': self._detect_intent(query_lower),
-            'keywords': self._extract_keywords(query_lower),
+            'keywords': self._extract_keywords(query_lower, tokens),
             'time_context': self._extract_time_context(query_lower),
             'location_context': self._extract_location_context(query_lower),
             'contains_slang': self._contains_slang(query_lower)
@@ -58,30 +248,17 @@ class LocalReasoningEngine:
     
     def _detect_intent(self, query: str) -> str:
         """Detect the primary intent of the query"""
-        intent_patterns = {
-            'food_recommendation': ['eat', 'food', 'hungry', 'restaurant', 'street food', 'vada pav', 'bhel'],
-            'transport_query': ['reach', 'go to', 'travel', 'auto', 'train', 'bus', 'traffic', 'commute'],
-            'slang_translation': ['meaning', 'what does', 'translate', 'bhai', 'scene'],
-            'cultural_advice': ['wear', 'appropriate', 'etiquette', 'culture', 'okay to'],
-            'timing_query': ['when', 'time', 'hours', 'open', 'close', 'peak'],
-            'weather_query': ['weather', 'rain', 'monsoon', 'hot', 'cold'],
-            'festival_query': ['festival', 'celebration', 'ganesh', 'diwali', 'navratri'],
-            'safety_query': ['safe', 'danger', 'avoid', 'careful', 'security'],
-            'pricing_query': ['cost', 'price', 'expensive', 'cheap', 'budget']
-        }
-        
-        for intent, keywords in intent_patterns.items():
+        for intent, keywords in self._INTENT_PATTERNS.items():
             if any(keyword in query for keyword in keywords):
                 return intent
         
         return 'general_query'
     
-    def _extract_keywords(self, query: str) -> List[str]:
-        """Extract important keywords from query"""
+    def _extract_keywords(self, query: str, tokens: Optional[List[str]] = None) -> List[str]:
+        """Extract important keywords from query, optionally from its already tokenised lowercase words"""
         # Remove common words and extract meaningful terms
-        stop_words = {'the', 'is', 'at', 'which', 'on', 'a', 'an', 'and', 'or', 'but', 'in', 'with', 'to', 'for', 'of', 'as', 'by'}
-        words = re.findall(r'\b\w+\b', query.lower())
-        return [word for word in words if word not in stop_words and len(word) > 2]
+        words = tokens if tokens is not None else _WORD_RE.findall(query.lower())
+        return [word for word in words if word not in self._STOP_WORDS and len(word) > 2]
     
     def _extract_time_context(self, query: str) -> Dict[str, Any]:
         """Extract time-related context from query"""
@@ -92,33 +269,20 @@ class LocalReasoningEngine:
         }
         
         # Check for specific times
-        time_patterns = [
-            r'(\d{1,2}):(\d{2})\s*(am|pm)?',
-            r'(\d{1,2})\s*(am|pm)',
-        ]
-        
-        for pattern in time_patterns:
-            match = re.search(pattern, query)
+        for pattern in _TIME_PATTERNS:
+            match = pattern.search(query)
             if match:
                 time_context['specific_time'] = match.group(0)
                 break
         
         # Check for time periods
-        time_periods = {
-            'morning': ['morning', 'am', 'breakfast'],
-            'afternoon': ['afternoon', 'lunch', 'noon'],
-            'evening': ['evening', 'dinner', 'night'],
-            'late_night': ['late night', 'midnight', 'late']
-        }
-        
-        for period, keywords in time_periods.items():
+        for period, keywords in self._TIME_PERIODS.items():
             if any(keyword in query for keyword in keywords):
                 time_context['time_period'] = period
                 break
         
         # Check for relative time
-        relative_patterns = ['now', 'today', 'tonight', 'tomorrow', 'later', 'soon']
-        for pattern in relative_patterns:
+        for pattern in self._RELATIVE_TIMES:
             if pattern in query:
                 time_context['relative_time'] = pattern
                 break
@@ -127,25 +291,14 @@ class LocalReasoningEngine:
     
     def _extract_location_context(self, query: str) -> List[str]:
         """Extract location mentions from query"""
-        # This would be enhanced with locations from product.md
-        locations = []
-        
         # Get locations from context
-        context_data = self.context_loader.structured_data
-        if 'food' in context_data and 'areas' in context_data['food']:
-            for area in context_data['food']['areas'].keys():
-                if area.lower() in query:
-                    locations.append(area)
-        
-        return locations
+        self._refresh_context_cache()
+        return [area for area, area_lower in self._area_names if area_lower in query]
     
     def _contains_slang(self, query: str) -> bool:
         """Check if query contains local slang"""
-        context_data = self.context_loader.structured_data
-        if 'slang' in context_data:
-            slang_words = context_data['slang'].keys()
-            return any(slang in query for slang in slang_words)
-        return False
+        self._refresh_context_cache()
+        return any(slang in query for slang in self._slang_words)
     
     def _get_relevant_context(self, query: str, query_analysis: Dict[str, Any]) -> List[ContextItem]:
         """Retrieve relevant context based on query and analysis"""
@@ -153,60 +306,28 @@ class LocalReasoningEngine:
         
         # Get context based on intent
         intent = query_analysis['intent']
-        category_mapping = {
-            'food_recommendation': ContextCategory.FOOD,
-            'transport_query': ContextCategory.TRANSPORT,
-            'slang_translation': ContextCategory.SLANG,
-            'cultural_advice': ContextCategory.CULTURE,
-            'timing_query': ContextCategory.TIMING,
-            'weather_query': ContextCategory.WEATHER,
-            'festival_query': ContextCategory.FESTIVALS,
-            'safety_query': ContextCategory.SAFETY,
-            'pricing_query': ContextCategory.COST
-        }
-        
-        if intent in category_mapping:
-            category_context = self.context_loader.get_context_by_category(category_mapping[intent])
+        if intent in self._INTENT_CATEGORIES:
+            category_context = self.context_loader.get_context_by_category(self._INTENT_CATEGORIES[intent])
             relevant_context.extend(category_context)
         
         # Also search for general relevant context
         search_results = self.context_loader.search_context(query)
         relevant_context.extend(search_results)
         
-        # Remove duplicates and sort by confidence
-        seen_sources = set()
-        unique_context = []
+        # Remove duplicates (first item per source wins) and sort by confidence
+        unique_context = {}
         for item in relevant_context:
-            if item.source_section not in seen_sources:
-                unique_context.append(item)
-                seen_sources.add(item.source_section)
+            unique_context.setdefault(item.source_section, item)
         
-        return sorted(unique_context, key=lambda x: x.confidence, reverse=True)[:5]  # Top 5 most relevant
+        return heapq.nlargest(5, unique_context.values(), key=attrgetter('confidence'))  # Top 5 most relevant
     
     def _apply_local_reasoning(self, query: str, query_analysis: Dict[str, Any], 
                              context: List[ContextItem], current_time: datetime) -> ReasoningResult:
         """Apply local reasoning logic based on context"""
         
-        intent = query_analysis['intent']
-        reasoning_chain = []
-        sources_used = []
-        missing_info = []
-        
         # Apply intent-specific reasoning
-        if intent == 'food_recommendation':
-            result = self._reason_food_recommendation(query, query_analysis, context, current_time)
-        elif intent == 'transport_query':
-            result = self._reason_transport_query(query, query_analysis, context, current_time)
-        elif intent == 'slang_translation':
-            result = self._reason_slang_translation(query, query_analysis, context)
-        elif intent == 'cultural_advice':
-            result = self._reason_cultural_advice(query, query_analysis, context)
-        elif intent == 'timing_query':
-            result = self._reason_timing_query(query, query_analysis, context, current_time)
-        else:
-            result = self._reason_general_query(query, query_analysis, context)
-        
-        return result
+        reasoner = self._REASONERS.get(query_analysis['intent'], LocalReasoningEngine._reason_general_query)
+        return reasoner(self, query, query_analysis, context, current_time)
     
     def _reason_food_recommendation(self, query: str, analysis: Dict[str, Any], 
                                   context: List[ContextItem], current_time: datetime) -> ReasoningResult:
@@ -240,17 +361,17 @@ class LocalReasoningEngine:
         
         # Parse food data
         try:
-            food_data = eval(food_context.content) if isinstance(food_context.content, str) else food_context.content
-        except:
-            food_data = {'timings': {}, 'areas': {}}
+            food_data = _typed_context(food_context, FoodContext)
+        except (ValueError, SyntaxError):
+            food_data = FoodContext(timings={}, areas={}, hygiene_tips=None)
         
         response_parts = []
         confidence = 0.8
         
         # Time-based recommendations
-        if 'timings' in food_data:
+        if food_data.timings is not None:
             reasoning_chain.append("Checking time-appropriate food options")
-            for timing_key, foods in food_data['timings'].items():
+            for timing_key, foods in food_data.timings.items():
                 if time_period.lower() in timing_key.lower():
                     response_parts.append(f"For {time_period}, I'd recommend: {foods}")
                     reasoning_chain.append(f"Found timing match: {timing_key}")
@@ -258,16 +379,16 @@ class LocalReasoningEngine:
         
         # Location-based recommendations
         locations = analysis.get('location_context', [])
-        if locations and 'areas' in food_data:
+        if locations and food_data.areas is not None:
             reasoning_chain.append(f"Checking recommendations for mentioned locations: {locations}")
             for location in locations:
-                if location in food_data['areas']:
-                    area_info = food_data['areas'][location]
+                if location in food_data.areas:
+                    area_info = food_data.areas[location]
                     response_parts.append(f"At {location}: {area_info['foods']} ({area_info['timing']})")
                     reasoning_chain.append(f"Found location-specific info for {location}")
         
         # Add hygiene tips if available
-        if 'hygiene_tips' in food_data and food_data['hygiene_tips']:
+        if food_data.hygiene_tips:
             response_parts.append("Local tip: Look for crowded stalls (high turnover = fresh food)")
             reasoning_chain.append("Added local hygiene wisdom")
         
@@ -325,15 +446,16 @@ class LocalReasoningEngine:
         
         if is_peak:
             response_parts.append("You're traveling during peak hours.")
-            if "after 7 pm roads are jammed" in str(timing_context.content if timing_context else ""):
+            if timing_context and self._has_post_7pm_jam:
                 response_parts.append("Roads are typically jammed after 7 PM - plan for extra travel time.")
                 reasoning_chain.append("Applied local timing pattern: post-7PM traffic")
         
         # Add transport mode advice
-        if 'auto' in query.lower():
+        query_lower = query.lower()
+        if 'auto' in query_lower:
             response_parts.append("For auto-rickshaw: insist on meter during day, expect 1.5x rate after midnight.")
             reasoning_chain.append("Added auto-rickshaw specific advice")
-        elif 'train' in query.lower() or 'local' in query.lower():
+        elif 'train' in query_lower or 'local' in query_lower:
             response_parts.append("Local train is fastest but most crowded during peak hours. Stand on left, let people exit first.")
             reasoning_chain.append("Added local train etiquette")
         
@@ -348,7 +470,7 @@ class LocalReasoningEngine:
         )
     
     def _reason_slang_translation(self, query: str, analysis: Dict[str, Any], 
-                                context: List[ContextItem]) -> ReasoningResult:
+                                context: List[ContextItem], current_time: datetime) -> ReasoningResult:
         """Translate local slang using context"""
         reasoning_chain = ["Analyzing slang translation request"]
         sources_used = []
@@ -374,8 +496,8 @@ class LocalReasoningEngine:
         
         # Parse slang data
         try:
-            slang_data = eval(slang_context.content) if isinstance(slang_context.content, str) else slang_context.content
-        except:
+            slang_data = _typed_context(slang_context, SlangContext).meanings
+        except (ValueError, SyntaxError):
             slang_data = {}
         
         # Extract slang words from query
@@ -405,7 +527,7 @@ class LocalReasoningEngine:
         )
     
     def _reason_cultural_advice(self, query: str, analysis: Dict[str, Any], 
-                              context: List[ContextItem]) -> ReasoningResult:
+                              context: List[ContextItem], current_time: datetime) -> ReasoningResult:
         """Provide cultural advice based on local context"""
         reasoning_chain = ["Analyzing cultural advice request"]
         sources_used = []
@@ -430,7 +552,7 @@ class LocalReasoningEngine:
             )
         
         # Parse cultural data
-        culture_data = eval(culture_context.content) if isinstance(culture_context.content, str) else culture_context.content
+        culture_data = _typed_context(culture_context, CultureContext)
         
         response_parts = []
         confidence = 0.8
@@ -438,17 +560,16 @@ class LocalReasoningEngine:
         # Check query against do's and don'ts
         query_lower = query.lower()
         
-        if 'dos' in culture_data:
-            for do_item in culture_data['dos']:
-                if any(keyword in query_lower for keyword in ['wear', 'dress', 'clothes', 'shorts']):
-                    if 'revealing clothes' in do_item.lower():
-                        response_parts.append(f"Cultural advice: {do_item}")
-                        reasoning_chain.append("Found relevant cultural guidance about clothing")
+        if culture_data.dos is not None and any(keyword in query_lower for keyword in self._CLOTHING_KEYWORDS):
+            for do_item, do_lower in culture_data.dos:
+                if 'revealing clothes' in do_lower:
+                    response_parts.append(f"Cultural advice: {do_item}")
+                    reasoning_chain.append("Found relevant cultural guidance about clothing")
         
-        if 'donts' in culture_data:
-            for dont_item in culture_data['donts']:
+        if culture_data.donts is not None:
+            for dont_item, dont_words in culture_data.donts:
                 # Match query context with don'ts
-                if any(keyword in query_lower for keyword in dont_item.lower().split()):
+                if any(keyword in query_lower for keyword in dont_words):
                     response_parts.append(f"Important: {dont_item}")
                     reasoning_chain.append(f"Found relevant cultural restriction: {dont_item}")
         
@@ -487,7 +608,7 @@ class LocalReasoningEngine:
         )
     
     def _reason_general_query(self, query: str, analysis: Dict[str, Any], 
-                            context: List[ContextItem]) -> ReasoningResult:
+                            context: List[ContextItem], current_time: datetime) -> ReasoningResult:
         """Handle general queries using available context"""
         reasoning_chain = ["Analyzing general query"]
         sources_used = []
@@ -511,13 +632,15 @@ class LocalReasoningEngine:
             missing_info=["Relevant local information for this query"]
         )
     
+    # Intent -> reasoning method; anything else is answered as a general query
+    _REASONERS = {
+        'food_recommendation': _reason_food_recommendation,
+        'transport_query': _reason_transport_query,
+        'slang_translation': _reason_slang_translation,
+        'cultural_advice': _reason_cultural_advice,
+        'timing_query': _reason_timing_query
+    }
+    
     def _get_time_period(self, hour: int) -> str:
-        """Convert hour to time period"""
-        if 6 <= hour < 10:
-            return "morning"
-        elif 10 <= hour < 15:
-            return "afternoon"
-        elif 15 <= hour < 20:
-            return "evening"
-        else:
-            return "night"
\ No newline at end of file
+        """Convert hour (0-23) to time period"""
+        return _HOUR_TO_PERIOD[hour]
\ No newline at end of file
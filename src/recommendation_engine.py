@@ -4,13 +4,41 @@ Provides context-aware recommendations for food, places, and activities
 Uses local timing, crowd patterns, budget, and weather considerations
 """
 
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime, time
 from enum import Enum
+import re
 
 from .context_loader import ContextLoader, ContextCategory
 
+# Time period for each hour of the day, and the peak travel hours (8-11 AM, 6-9 PM)
+_HOUR_TO_PERIOD = ('night',) * 6 + ('morning',) * 4 + ('afternoon',) * 5 + ('evening',) * 5 + ('night',) * 4
+_PEAK_HOURS = frozenset(range(8, 12)) | frozenset(range(18, 22))
+
+# Leading rupee amount of a price string such as '₹15-25'
+_PRICE_RE = re.compile(r'₹(\d+)')
+
+# Inclusive price range in rupees for each budget level
+_BUDGET_RANGES = {
+    'low': (0, 50),
+    'medium': (50, 150),
+    'high': (150, float('inf'))
+}
+
+# (title, description, reasoning) answered when a context section is missing
+_MISSING_SECTION = {
+    'food': ("No Food Information",
+             "Food information is not present in the local context file.",
+             "Missing local food data"),
+    'transport': ("No Transport Information",
+                  "Transport information is not present in the local context file.",
+                  "Missing local transport data"),
+    'safety': ("No Safety Information",
+               "Safety information is not present in the local context file.",
+               "Missing local safety data")
+}
+
 class RecommendationType(Enum):
     FOOD = "food"
     TRANSPORT = "transport"
@@ -42,41 +70,59 @@ class RecommendationEngine:
     def __init__(self, context_loader: ContextLoader):
         self.context_loader = context_loader
         self.context_data = context_loader.structured_data
+        self._context_source = None
+        self._refresh_context_data()
+    
+    def _refresh_context_data(self):
+        """Resolve the context sections used by each recommendation type when the loaded context changes.
+        
+        The engine is usually built before load_context() runs, which replaces
+        structured_data, so this is rechecked on every request rather than only at init.
+        """
+        context_data = self.context_loader.structured_data
+        if self._context_source is context_data:
+            return
+        
+        self._context_source = context_data
+        self.context_data = context_data
+        self._food_data = context_data.get('food')
+        self._transport_data = context_data.get('transport')
+        self._safety_data = context_data.get('safety')
+        self._festival_data = context_data.get('festivals')
+        self._pricing_data = context_data.get('pricing')
+        
+        # (lowercase name, name, info) for each food area, in product.md order
+        areas = self._food_data.get('areas', {}) if self._food_data is not None else {}
+        self._areas_lower: List[Tuple[str, str, Dict[str, str]]] = [
+            (area.lower(), area, area_info) for area, area_info in areas.items()
+        ]
+        self._has_festival_keyword = 'festival' in str(self._festival_data).lower()
+        self._priced_items: Optional[List[Tuple[str, List[Tuple[int, str]]]]] = None
         
     def get_recommendations(self, request: RecommendationRequest) -> List[Recommendation]:
         """Get recommendations based on request parameters"""
-        
-        if request.type == RecommendationType.FOOD:
-            return self._get_food_recommendations(request)
-        elif request.type == RecommendationType.TRANSPORT:
-            return self._get_transport_recommendations(request)
-        elif request.type == RecommendationType.ACTIVITY:
-            return self._get_activity_recommendations(request)
-        elif request.type == RecommendationType.SAFETY:
-            return self._get_safety_recommendations(request)
-        else:
+        self._refresh_context_data()
+        handler = self._HANDLERS.get(request.type)
+        if handler is None:
             return []
+        return handler(self, request)
     
     def _get_food_recommendations(self, request: RecommendationRequest) -> List[Recommendation]:
         """Generate food recommendations based on context and constraints"""
         recommendations = []
         
-        if 'food' not in self.context_data:
-            return [Recommendation(
-                title="No Food Information",
-                description="Food information is not present in the local context file.",
-                reasoning="Missing local food data",
-                confidence=0.0
-            )]
+        food_data = self._food_data
+        if food_data is None:
+            return self._missing_section('food')
         
-        food_data = self.context_data['food']
         current_hour = request.current_time.hour
         time_period = self._get_time_period(current_hour)
         
         # Time-based recommendations
         if 'timings' in food_data:
+            # Period names from _HOUR_TO_PERIOD are already lowercase
             for timing_key, foods in food_data['timings'].items():
-                if time_period.lower() in timing_key.lower():
+                if time_period in timing_key.lower():
                     recommendations.append(Recommendation(
                         title=f"Perfect for {time_period}",
                         description=foods,
@@ -87,8 +133,9 @@ class RecommendationEngine:
         
         # Location-based recommendations
         if request.location and 'areas' in food_data:
-            for area, area_info in food_data['areas'].items():
-                if request.location.lower() in area.lower() or area.lower() in request.location.lower():
+            location_lower = request.location.lower()
+            for area_lower, area, area_info in self._areas_lower:
+                if location_lower in area_lower or area_lower in location_lower:
                     crowd_advice = self._get_crowd_advice(area_info.get('timing', ''), request.current_time)
                     
                     recommendations.append(Recommendation(
@@ -101,29 +148,25 @@ class RecommendationEngine:
                     ))
         
         # Budget-aware recommendations
-        if request.budget_level and 'pricing' in self.context_data:
-            pricing_data = self.context_data['pricing']
-            budget_recs = self._filter_by_budget(pricing_data, request.budget_level)
+        if request.budget_level and self._pricing_data is not None:
+            budget_recs = self._filter_by_budget(request.budget_level)
             recommendations.extend(budget_recs)
         
-        # Weather-based adjustments
+        recommendations = recommendations[:5]  # Return top 5 recommendations
+        
+        # Weather-based adjustments, only for the recommendations returned
         if request.weather_condition:
-            weather_recs = self._adjust_for_weather(recommendations, request.weather_condition)
-            recommendations = weather_recs
+            self._adjust_for_weather(recommendations, request.weather_condition)
         
-        return recommendations[:5]  # Return top 5 recommendations
+        return recommendations
     
     def _get_transport_recommendations(self, request: RecommendationRequest) -> List[Recommendation]:
         """Generate transport recommendations"""
         recommendations = []
         
-        if 'transport' not in self.context_data:
-            return [Recommendation(
-                title="No Transport Information",
-                description="Transport information is not present in the local context file.",
-                reasoning="Missing local transport data",
-                confidence=0.0
-            )]
+        transport_data = self._transport_data
+        if transport_data is None:
+            return self._missing_section('transport')
         
         current_hour = request.current_time.hour
         is_peak = self._is_peak_hour(current_hour)
@@ -149,8 +192,6 @@ class RecommendationEngine:
             ))
         
         # Mode-specific recommendations
-        transport_data = self.context_data['transport']
-        
         # Local train advice
         if 'local_trains' in transport_data or any('train' in str(v).lower() for v in transport_data.values()):
             recommendations.append(Recommendation(
@@ -206,15 +247,10 @@ class RecommendationEngine:
         """Generate safety recommendations"""
         recommendations = []
         
-        if 'safety' not in self.context_data:
-            return [Recommendation(
-                title="No Safety Information",
-                description="Safety information is not present in the local context file.",
-                reasoning="Missing local safety data",
-                confidence=0.0
-            )]
+        safety_data = self._safety_data
+        if safety_data is None:
+            return self._missing_section('safety')
         
-        safety_data = self.context_data['safety']
         current_hour = request.current_time.hour
         
         # Time-based safety advice
@@ -242,101 +278,111 @@ class RecommendationEngine:
         
         return recommendations
     
+    _HANDLERS = {
+        RecommendationType.FOOD: _get_food_recommendations,
+        RecommendationType.TRANSPORT: _get_transport_recommendations,
+        RecommendationType.ACTIVITY: _get_activity_recommendations,
+        RecommendationType.SAFETY: _get_safety_recommendations
+    }
+    
+    def _missing_section(self, section: str) -> List[Recommendation]:
+        """Placeholder recommendation for a missing context section.
+        
+        Built fresh each time: festival and weather adjustments mutate the
+        recommendations they are given, so they cannot be shared.
+        """
+        title, description, reasoning = _MISSING_SECTION[section]
+        return [Recommendation(title=title, description=description, reasoning=reasoning, confidence=0.0)]
+    
     def _get_time_period(self, hour: int) -> str:
-        """Convert hour to time period"""
-        if 6 <= hour < 10:
-            return "morning"
-        elif 10 <= hour < 15:
-            return "afternoon"
-        elif 15 <= hour < 20:
-            return "evening"
-        else:
-            return "night"
+        """Convert hour (0-23) to time period"""
+        return _HOUR_TO_PERIOD[hour]
     
     def _is_peak_hour(self, hour: int) -> bool:
         """Check if current hour is peak time"""
-        return (8 <= hour <= 11) or (18 <= hour <= 21)
+        return hour in _PEAK_HOURS
     
     def _get_crowd_advice(self, timing_info: str, current_time: datetime) -> str:
         """Generate crowd level advice based on timing"""
         current_hour = current_time.hour
+        timing_lower = timing_info.lower()
         
         # Parse timing info for crowd patterns
-        if 'evening' in timing_info.lower() and 16 <= current_hour <= 20:
+        if 'evening' in timing_lower and 16 <= current_hour <= 20:
             return "High - Peak evening crowd"
-        elif 'morning' in timing_info.lower() and 8 <= current_hour <= 10:
+        elif 'morning' in timing_lower and 8 <= current_hour <= 10:
             return "High - Morning rush"
         elif self._is_peak_hour(current_hour):
             return "Moderate to High"
         else:
             return "Low to Moderate"
     
-    def _filter_by_budget(self, pricing_data: Dict[str, Any], budget_level: str) -> List[Recommendation]:
+    def _get_priced_items(self) -> List[Tuple[str, List[Tuple[int, str]]]]:
+        """(category, [(price, 'item (price)'), ...]) for each priced category, parsed on first use"""
+        priced_items = self._priced_items
+        if priced_items is None:
+            # Built in full before it is published, so other request threads never
+            # see a partial table
+            priced_items = []
+            for category, items in self._pricing_data.items():
+                if isinstance(items, dict):
+                    priced = []
+                    for item, price_str in items.items():
+                        # Extract numeric price (simplified)
+                        price_match = _PRICE_RE.search(price_str)
+                        if price_match:
+                            priced.append((int(price_match.group(1)), f"{item} ({price_str})"))
+                    priced_items.append((category, priced))
+            self._priced_items = priced_items
+        return priced_items
+    
+    def _filter_by_budget(self, budget_level: str) -> List[Recommendation]:
         """Filter recommendations by budget level"""
         recommendations = []
         
-        budget_ranges = {
-            'low': (0, 50),
-            'medium': (50, 150),
-            'high': (150, float('inf'))
-        }
-        
-        min_budget, max_budget = budget_ranges.get(budget_level, (0, float('inf')))
-        
-        for category, items in pricing_data.items():
-            if isinstance(items, dict):
-                suitable_items = []
-                for item, price_str in items.items():
-                    import re
-        # Extract numeric price (simplified)
-                    price_match = re.search(r'₹(\d+)', price_str)
-                    if price_match:
-                        price = int(price_match.group(1))
-                        if min_budget <= price <= max_budget:
-                            suitable_items.append(f"{item} ({price_str})")
-                
-                if suitable_items:
-                    recommendations.append(Recommendation(
-                        title=f"Budget-Friendly {category.title()}",
-                        description=", ".join(suitable_items),
-                        reasoning=f"Items matching {budget_level} budget range",
-                        confidence=0.7,
-                        budget_info=f"Within {budget_level} budget range"
-                    ))
+        min_budget, max_budget = _BUDGET_RANGES.get(budget_level, (0, float('inf')))
+        
+        for category, priced in self._get_priced_items():
+            suitable_items = [label for price, label in priced if min_budget <= price <= max_budget]
+            
+            if suitable_items:
+                recommendations.append(Recommendation(
+                    title=f"Budget-Friendly {category.title()}",
+                    description=", ".join(suitable_items),
+                    reasoning=f"Items matching {budget_level} budget range",
+                    confidence=0.7,
+                    budget_info=f"Within {budget_level} budget range"
+                ))
         
         return recommendations
     
-    def _adjust_for_weather(self, recommendations: List[Recommendation], weather_condition: str) -> List[Recommendation]:
-        """Adjust recommendations based on weather"""
-        adjusted_recs = []
-        
-        for rec in recommendations:
-            adjusted_rec = rec
-            
-            if 'rain' in weather_condition.lower():
+    def _adjust_for_weather(self, recommendations: List[Recommendation], weather_condition: str) -> None:
+        """Adjust recommendations in place based on weather"""
+        weather_lower = weather_condition.lower()
+        
+        # The weather is the same for every recommendation, so branch on it once
+        # and apply the matching adjustment to the whole batch
+        if 'rain' in weather_lower:
+            for rec in recommendations:
                 # Add weather considerations for rainy weather
-                adjusted_rec.weather_consideration = "Monsoon: Check for covered areas, carry umbrella"
+                rec.weather_consideration = "Monsoon: Check for covered areas, carry umbrella"
                 if 'outdoor' in rec.description.lower():
-                    adjusted_rec.confidence *= 0.7  # Reduce confidence for outdoor activities
-            elif 'hot' in weather_condition.lower():
-                adjusted_rec.weather_consideration = "Hot weather: Stay hydrated, prefer AC venues"
-            
-            adjusted_recs.append(adjusted_rec)
-        
-        return adjusted_recs
+                    rec.confidence *= 0.7  # Reduce confidence for outdoor activities
+        elif 'hot' in weather_lower:
+            for rec in recommendations:
+                rec.weather_consideration = "Hot weather: Stay hydrated, prefer AC venues"
     
     def get_festival_aware_recommendations(self, request: RecommendationRequest, 
                                         festival_name: Optional[str] = None) -> List[Recommendation]:
         """Get recommendations that consider ongoing festivals"""
         recommendations = []
         
-        if 'festivals' not in self.context_data:
+        self._refresh_context_data()
+        if self._festival_data is None:
             return self.get_recommendations(request)
         
-        festival_data = self.context_data['festivals']
-        
         # Check if there's festival impact information
-        if festival_name or 'festival' in str(festival_data).lower():
+        if festival_name or self._has_festival_keyword:
             recommendations.append(Recommendation(
                 title="Festival Impact Advisory",
                 description="Expect 2x normal travel time, crowded areas, and special festival foods available.",
@@ -349,9 +395,10 @@ class RecommendationEngine:
         
         # Add regular recommendations with festival adjustments
         regular_recs = self.get_recommendations(request)
-        for rec in regular_recs:
-            if festival_name:
-                rec.description += f" (Note: {festival_name} celebrations may affect availability and crowds)"
+        if festival_name:
+            festival_note = f" (Note: {festival_name} celebrations may affect availability and crowds)"
+            for rec in regular_recs:
+                rec.description += festival_note
                 rec.confidence *= 0.8  # Slightly reduce confidence due to festival uncertainty
         
         recommendations.extend(regular_recs)
@@ -5,11 +5,70 @@ Handles mixed language sentences
 """
 
 import re
+import threading
+from collections import OrderedDict
 from typing import Dict, List, Tuple, Optional, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, replace as dataclass_replace
 
 from .context_loader import ContextLoader
 
+# Common Hindi/local language words checked by detect_language_mix
+_LOCAL_WORDS = frozenset(('kya', 'hai', 'ka', 'ke', 'ko'))
+_LOCAL_WORDS_RE = re.compile(r'\b(?:' + '|'.join(_LOCAL_WORDS) + r')\b')
+_ENGLISH_WORD_RE = re.compile(r'\b[a-zA-Z]+\b')
+
+# Mixed language words for interpret_mixed_language: word -> meaning
+_MIXED_WORDS = {
+    'bhai': 'brother/friend',
+    'scene': 'plan/situation',
+    'kya': 'what',
+    'hai': 'is/are'
+}
+_MIXED_WORDS_RE = re.compile(r'\b(?:' + '|'.join(_MIXED_WORDS) + r')\b', re.IGNORECASE)
+
+# Translation confidence indexed by the number of slang words found; past the
+# end of each table the confidence is already clamped to 1.0
+_STANDARD_CONFIDENCE = (0.0,) + tuple(min(1.0, n * 0.3 + 0.4) for n in range(1, 3))
+_LOCAL_CONFIDENCE = (0.2,) + tuple(min(1.0, n * 0.2 + 0.3) for n in range(1, 5))
+
+# Common Mumbai expressions swapped in by _add_local_flavor
+_LOCAL_FLAVOR = {
+    'how are you': 'kya scene hai bhai',
+    "what's up": 'kya scene hai',
+    'okay': 'chalta hai',
+    'no problem': 'koi scene nahi',
+    "let's go": 'chalo bhai'
+}
+_LOCAL_FLAVOR_RE = re.compile(r'\b(?:' + '|'.join(map(re.escape, _LOCAL_FLAVOR)) + r')\b', re.IGNORECASE)
+
+# Slang worth suggesting for each kind of context
+_SUGGESTION_MAP = {
+    'food': ('tapri', 'cutting', 'vada pav', 'bhel'),
+    'transport': ('auto', 'local'),
+    'greeting': ('bhai', 'scene'),
+    'agreement': ('chalta hai', 'bindaas'),
+    'casual': ('timepass', 'jugaad')
+}
+
+# Usage examples (would be enhanced with more data); the meaning comes from product.md
+_USAGE_EXAMPLES = {
+    'bhai': {
+        'usage': 'Used to address anyone in a friendly manner',
+        'example': 'Bhai, kya scene hai? (Brother, what\'s the plan?)',
+        'context': 'Universal term of address in Mumbai'
+    },
+    'scene': {
+        'usage': 'Used to ask about plans or situations',
+        'example': 'Kal ka scene kya hai? (What\'s tomorrow\'s plan?)',
+        'context': 'Very common in Mumbai youth conversations'
+    },
+    'cutting': {
+        'usage': 'Used when ordering tea at street stalls',
+        'example': 'Ek cutting dena (Give me half a cup of tea)',
+        'context': 'Specific to Mumbai tea culture'
+    }
+}
+
 @dataclass
 class SlangTranslation:
     original_text: str
@@ -19,35 +78,105 @@ class SlangTranslation:
     cultural_context: Optional[str] = None
 
 class SlangInterpreter:
+    # Maximum number of texts whose language-mix detection or translation is remembered
+    _CACHE_SIZE = 256
+    
     def __init__(self, context_loader: ContextLoader):
         self.context_loader = context_loader
-        self.slang_dict = self._load_slang_dictionary()
+        self._mix_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._mix_cache_lock = threading.Lock()
+        self._translation_cache: "OrderedDict[Tuple[int, str, str], SlangTranslation]" = OrderedDict()
+        self._translation_cache_lock = threading.Lock()
+        self._slang_generation = 0
+        self._slang_source = None
+        self._refresh_slang_data()
+        
+    def _refresh_slang_data(self):
+        """Reload the slang dictionary, its reverse lookup and their patterns when the loaded context changes.
+        
+        LocalGuideSystem builds the interpreter before load_context() replaces
+        structured_data, so this is rechecked on use rather than only at init.
+        """
+        context_data = self.context_loader.structured_data
+        if self._slang_source is context_data:
+            return
+        
+        slang_dict = self._load_slang_dictionary()
+        # Each dictionary is swapped in together with its pattern so a concurrent
+        # translation never pairs a pattern with the wrong dictionary
+        self._slang_lookup = (slang_dict, self._compile_word_alternation(slang_dict))
+        
+        # Reverse lookup - English meanings that have slang equivalents
+        reverse_slang = {v.lower(): k for k, v in slang_dict.items()}
+        self._reverse_lookup = (reverse_slang, self._compile_word_alternation(reverse_slang))
+        self.slang_dict = slang_dict
         
+        # Translations made with the old dictionary are dropped, and the generation
+        # in their keys keeps any still in flight from being served later
+        self._slang_generation += 1
+        with self._mix_cache_lock:
+            self._mix_cache.clear()
+        with self._translation_cache_lock:
+            self._translation_cache.clear()
+        self._slang_source = context_data
+    
     def _load_slang_dictionary(self) -> Dict[str, str]:
         """Load slang dictionary from context"""
         context_data = self.context_loader.structured_data
         return context_data.get('slang', {})
     
+    @staticmethod
+    def _compile_word_alternation(words) -> Optional[re.Pattern]:
+        """Case-insensitive whole-word pattern for any of words (longest first), or None if empty.
+        
+        Lookarounds rather than \\b, so phrases ending in punctuation such as
+        'brother (used for everyone)' still match.
+        """
+        if not words:
+            return None
+        alternatives = sorted(words, key=len, reverse=True)
+        return re.compile(r'(?<!\w)(?:' + '|'.join(map(re.escape, alternatives)) + r')(?!\w)', re.IGNORECASE)
+    
+    def _cached_translation(self, kind: str, text: str, translate) -> SlangTranslation:
+        """Memoize a translation of text; callers get their own copy of the found-words list"""
+        self._refresh_slang_data()
+        key = (self._slang_generation, kind, text)
+        with self._translation_cache_lock:
+            cached = self._translation_cache.get(key)
+            if cached is not None:
+                self._translation_cache.move_to_end(key)
+        
+        if cached is None:
+            cached = translate(text)
+            with self._translation_cache_lock:
+                self._translation_cache[key] = cached
+                if len(self._translation_cache) > self._CACHE_SIZE:
+                    self._translation_cache.popitem(last=False)
+        
+        return dataclass_replace(cached, slang_words_found=list(cached.slang_words_found))
+    
     def translate_to_standard(self, text: str) -> SlangTranslation:
         """Translate local slang to standard English"""
+        return self._cached_translation('standard', text, self._translate_to_standard)
+    
+    def _translate_to_standard(self, text: str) -> SlangTranslation:
         original_text = text
         translated_text = text
         slang_words_found = []
         
-        # Find and replace slang words
-        words = re.findall(r'\b\w+\b', text.lower())
-        
-        for word in words:
-            if word in self.slang_dict:
-                meaning = self.slang_dict[word]
+        # Find and replace slang words in a single pass
+        slang_dict, slang_pattern = self._slang_lookup
+        if slang_pattern is not None:
+            def replace(match):
+                word = match.group(0).lower()
+                meaning = slang_dict[word]
                 slang_words_found.append((word, meaning))
-                
-                # Replace in translated text (case-insensitive)
-                pattern = re.compile(re.escape(word), re.IGNORECASE)
-                translated_text = pattern.sub(f"{meaning}", translated_text)
+                return meaning
+            
+            translated_text = slang_pattern.sub(replace, text)
         
         # Calculate confidence based on how many slang words were found
-        confidence = min(1.0, len(slang_words_found) * 0.3 + 0.4) if slang_words_found else 0.0
+        confidence = _STANDARD_CONFIDENCE[min(len(slang_words_found), len(_STANDARD_CONFIDENCE) - 1)]
         
         # Add cultural context for common phrases
         cultural_context = self._get_cultural_context(text, slang_words_found)
@@ -62,24 +191,36 @@ class SlangInterpreter:
     
     def translate_to_local(self, text: str) -> SlangTranslation:
         """Translate standard English to local slang"""
+        return self._cached_translation('local', text, self._translate_to_local)
+    
+    def _translate_to_local(self, text: str) -> SlangTranslation:
         original_text = text
         translated_text = text
         slang_words_found = []
         
-        # Reverse lookup - find English words that have slang equivalents
-        reverse_slang = {v.lower(): k for k, v in self.slang_dict.items()}
-        
-        # Simple word replacement (can be enhanced with NLP)
-        for english_word, slang_word in reverse_slang.items():
-            if english_word in text.lower():
-                slang_words_found.append((slang_word, english_word))
-                pattern = re.compile(re.escape(english_word), re.IGNORECASE)
-                translated_text = pattern.sub(slang_word, translated_text)
+        # Simple word replacement (can be enhanced with NLP), in a single pass
+        reverse_slang, reverse_pattern = self._reverse_lookup
+        if reverse_pattern is not None:
+            matched = set()
+            
+            def replace(match):
+                english_word = match.group(0).lower()
+                matched.add(english_word)
+                return reverse_slang[english_word]
+            
+            translated_text = reverse_pattern.sub(replace, text)
+            
+            # Report each phrase once, in dictionary order
+            slang_words_found = [
+                (slang_word, english_word)
+                for english_word, slang_word in reverse_slang.items()
+                if english_word in matched
+            ]
         
         # Add common local expressions
         translated_text = self._add_local_flavor(translated_text)
         
-        confidence = min(1.0, len(slang_words_found) * 0.2 + 0.3) if slang_words_found else 0.2
+        confidence = _LOCAL_CONFIDENCE[min(len(slang_words_found), len(_LOCAL_CONFIDENCE) - 1)]
         
         return SlangTranslation(
             original_text=original_text,
@@ -90,6 +231,9 @@ class SlangInterpreter:
     
     def interpret_mixed_language(self, text: str) -> SlangTranslation:
         """Handle mixed language sentences (English + local language)"""
+        return self._cached_translation('mixed', text, self._interpret_mixed_language)
+    
+    def _interpret_mixed_language(self, text: str) -> SlangTranslation:
         # This is a simplified version - in reality, this would need
         # more sophisticated language detection and translation
         
@@ -97,20 +241,25 @@ class SlangInterpreter:
         slang_translation = self.translate_to_standard(text)
         
         # Then handle common mixed language patterns
-        mixed_patterns = {
-            r'\bbhai\b': 'brother/friend',
-            r'\bscene\b': 'plan/situation',
-            r'\bkya\b': 'what',
-            r'\bhai\b': 'is/are'
-        }
-        
         interpreted_text = slang_translation.translated_text
         additional_translations = []
         
-        for pattern, meaning in mixed_patterns.items():
-            if re.search(pattern, text.lower()):
-                interpreted_text = re.sub(pattern, f"({meaning})", interpreted_text, flags=re.IGNORECASE)
-                additional_translations.append((pattern.strip('\\b'), meaning))
+        # Only words present in the original text are replaced; one scan finds
+        # them and one substitution replaces them all. Words the slang dictionary
+        # already translated are not reported a second time
+        already_found = {word for word, _ in slang_translation.slang_words_found}
+        found = {word.lower() for word in _MIXED_WORDS_RE.findall(text.lower())} - already_found
+        if found:
+            def replace(match):
+                word = match.group(0).lower()
+                if word not in found:
+                    return match.group(0)
+                return f"({_MIXED_WORDS[word]})"
+            
+            interpreted_text = _MIXED_WORDS_RE.sub(replace, interpreted_text)
+            additional_translations = [
+                (word, meaning) for word, meaning in _MIXED_WORDS.items() if word in found
+            ]
         
         # Combine all found translations
         all_translations = slang_translation.slang_words_found + additional_translations
@@ -144,35 +293,15 @@ class SlangInterpreter:
     
     def _add_local_flavor(self, text: str) -> str:
         """Add local expressions to make text sound more local"""
-        # Add common Mumbai expressions
-        local_additions = {
-            r'\bhow are you\b': 'kya scene hai bhai',
-            r'\bwhat\'s up\b': 'kya scene hai',
-            r'\bokay\b': 'chalta hai',
-            r'\bno problem\b': 'koi scene nahi',
-            r'\blet\'s go\b': 'chalo bhai'
-        }
-        
-        modified_text = text
-        for pattern, replacement in local_additions.items():
-            modified_text = re.sub(pattern, replacement, modified_text, flags=re.IGNORECASE)
-        
-        return modified_text
+        # Add common Mumbai expressions in one pass
+        return _LOCAL_FLAVOR_RE.sub(lambda match: _LOCAL_FLAVOR[match.group(0).lower()], text)
     
     def get_slang_suggestions(self, context: str) -> List[str]:
         """Suggest appropriate slang based on context"""
         context_lower = context.lower()
         suggestions = []
         
-        suggestion_map = {
-            'food': ['tapri', 'cutting', 'vada pav', 'bhel'],
-            'transport': ['auto', 'local'],
-            'greeting': ['bhai', 'scene'],
-            'agreement': ['chalta hai', 'bindaas'],
-            'casual': ['timepass', 'jugaad']
-        }
-        
-        for category, slang_list in suggestion_map.items():
+        for category, slang_list in _SUGGESTION_MAP.items():
             if category in context_lower:
                 suggestions.extend(slang_list)
         
@@ -180,6 +309,7 @@ class SlangInterpreter:
     
     def explain_slang_usage(self, slang_word: str) -> Dict[str, str]:
         """Provide detailed explanation of slang usage"""
+        self._refresh_slang_data()
         if slang_word.lower() not in self.slang_dict:
             return {
                 'error': f"'{slang_word}' not found in local slang dictionary"
@@ -187,51 +317,54 @@ class SlangInterpreter:
         
         meaning = self.slang_dict[slang_word.lower()]
         
-        # Usage examples (would be enhanced with more data)
-        usage_examples = {
-            'bhai': {
-                'meaning': meaning,
-                'usage': 'Used to address anyone in a friendly manner',
-                'example': 'Bhai, kya scene hai? (Brother, what\'s the plan?)',
-                'context': 'Universal term of address in Mumbai'
-            },
-            'scene': {
-                'meaning': meaning,
-                'usage': 'Used to ask about plans or situations',
-                'example': 'Kal ka scene kya hai? (What\'s tomorrow\'s plan?)',
-                'context': 'Very common in Mumbai youth conversations'
-            },
-            'cutting': {
-                'meaning': meaning,
-                'usage': 'Used when ordering tea at street stalls',
-                'example': 'Ek cutting dena (Give me half a cup of tea)',
-                'context': 'Specific to Mumbai tea culture'
+        usage = _USAGE_EXAMPLES.get(slang_word.lower())
+        if usage is None:
+            usage = {
+                'usage': 'Local slang term',
+                'example': f'Example usage of {slang_word}',
+                'context': 'Part of local vocabulary'
             }
-        }
         
-        return usage_examples.get(slang_word.lower(), {
-            'meaning': meaning,
-            'usage': 'Local slang term',
-            'example': f'Example usage of {slang_word}',
-            'context': 'Part of local vocabulary'
-        })
+        return {'meaning': meaning, **usage}
     
     def detect_language_mix(self, text: str) -> Dict[str, Any]:
         """Detect if text contains mixed languages"""
+        self._refresh_slang_data()
+        
+        # process_query and the debug view both ask about the same text. Request
+        # threads share the cache, so it is only touched under its lock
+        with self._mix_cache_lock:
+            cached = self._mix_cache.get(text)
+            if cached is not None:
+                self._mix_cache.move_to_end(text)
+                return dict(cached)
+        
         # Simple detection based on known patterns
-        english_words = set(re.findall(r'\b[a-zA-Z]+\b', text))
-        slang_words = set(word for word in english_words if word.lower() in self.slang_dict)
+        english_words = set(_ENGLISH_WORD_RE.findall(text))
+        english_lower = [word.lower() for word in english_words]
+        slang_count = sum(word in self.slang_dict for word in english_lower)
         
-        # Common Hindi/local language patterns
-        local_patterns = [r'\bkya\b', r'\bhai\b', r'\bka\b', r'\bke\b', r'\bko\b']
-        local_matches = sum(1 for pattern in local_patterns if re.search(pattern, text.lower()))
+        # Number of distinct local words present. In ASCII text every local word
+        # is also one of the English-pattern words, so no second scan is needed;
+        # other text is rescanned since lowercasing can move word boundaries there
+        if text.isascii():
+            local_matches = len(_LOCAL_WORDS.intersection(english_lower))
+        else:
+            local_matches = len(set(_LOCAL_WORDS_RE.findall(text.lower())))
         
-        is_mixed = len(slang_words) > 0 or local_matches > 0
+        is_mixed = slang_count > 0 or local_matches > 0
         
-        return {
+        result = {
             'is_mixed_language': is_mixed,
             'english_words': len(english_words),
-            'slang_words': len(slang_words),
+            'slang_words': slang_count,
             'local_patterns': local_matches,
-            'confidence': min(1.0, (len(slang_words) + local_matches) * 0.2)
-        }
\ No newline at end of file
+            'confidence': min(1.0, (slang_count + local_matches) * 0.2)
+        }
+        
+        with self._mix_cache_lock:
+            self._mix_cache[text] = result
+            if len(self._mix_cache) > self._CACHE_SIZE:
+                self._mix_cache.popitem(last=False)
+        
+        return dict(result)
\ No newline at end of file
@@ -0,0 +1,181 @@
+"""
+Tests for The Local Guide System
+Run with: python -m pytest
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+# Let the file run as a plain script (python tests/test_system.py) from the repo root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.confidence_scorer import ConfidenceLevel, ConfidenceScore
+from src.context_loader import ContextLoader
+from src.local_guide_system import LocalGuideSystem
+
+PRODUCT_MD = str(Path(__file__).resolve().parent.parent / "product.md")
+
+
+def test_slang_translation_uses_loaded_context():
+    """The interpreter is built before load_context() runs, so it must pick up the loaded slang"""
+    system = LocalGuideSystem(PRODUCT_MD)
+
+    translation = system.translate_slang("Bhai, kya scene hai?", "to_standard")
+
+    assert ('bhai', 'Brother (used for everyone)') in translation.slang_words_found
+    assert ('scene', 'Plan/situation') in translation.slang_words_found
+    assert translation.translated_text.startswith('Brother (used for everyone), kya Plan/situation')
+    assert translation.confidence == 1.0
+
+
+def test_translate_to_local_uses_loaded_context():
+    """The reverse (English to slang) lookup is rebuilt from the loaded slang too"""
+    system = LocalGuideSystem(PRODUCT_MD)
+
+    translation = system.translate_slang("Half cup of tea, please", "to_local")
+
+    assert translation.slang_words_found == [('cutting', 'half cup of tea')]
+    assert translation.translated_text == "cutting, please"
+
+
+def test_translation_cache_follows_reloaded_context():
+    """Cached translations are not served once the slang dictionary changes"""
+    system = LocalGuideSystem(PRODUCT_MD)
+    interpreter = system.slang_interpreter
+
+    assert interpreter.translate_to_standard("bhai").translated_text == 'Brother (used for everyone)'
+
+    system.context_loader.structured_data = {'slang': {'bhai': 'Buddy'}}
+    assert interpreter.translate_to_standard("bhai").translated_text == 'Buddy'
+
+
+def test_nested_subsection_headings(tmp_path):
+    """#### headings stay inside the subsection parsing, as with the original subsection regex"""
+    product_md = tmp_path / "product.md"
+    product_md.write_text(
+        "## Weather Patterns\n### Monsoon\n- rain\n#### Late\n- floods\n### Winter\n- cool\n"
+        "## Local Pricing Expectations\n### Buses (best)\n- Bus ticket: ₹10\n#### Passes\n- Monthly pass: ₹500\n",
+        encoding="utf-8"
+    )
+
+    context = ContextLoader(str(product_md)).load_context()
+
+    assert context['weather'] == {'monsoon': '- rain', 'late': '- floods', 'winter': '- cool'}
+    assert context['pricing'] == {'buses (best)': {'Bus ticket': '₹10'}, 'passes': {'Monthly pass': '₹500'}}
+
+
+def test_cached_responses_are_not_shared():
+    """Mutating a response must not leak into later answers to the same query"""
+    system = LocalGuideSystem(PRODUCT_MD)
+    query = "Where can I eat street food in the evening?"
+
+    first = system.process_query(query)
+    first.confidence_score.factors.clear()
+    first.confidence_score.missing_information.append("mutated")
+    if first.recommendations:
+        first.recommendations[0].description = "mutated"
+
+    second = system.process_query(query)
+
+    assert second.confidence_score.factors
+    assert "mutated" not in second.confidence_score.missing_information
+    assert all(rec.description != "mutated" for rec in second.recommendations or ())
+
+
+def test_recommendations_use_loaded_context():
+    """The engine is built before load_context() runs, so it must pick up the loaded sections"""
+    system = LocalGuideSystem(PRODUCT_MD)
+
+    for recommendation_type in ("food", "transport", "safety"):
+        titles = [rec.title for rec in system.get_recommendations(
+            recommendation_type, current_time=datetime(2024, 1, 1, 19), location="Juhu Beach"
+        )]
+        assert not any(title.endswith(" Information") for title in titles)
+
+    food_titles = [rec.title for rec in system.get_recommendations(
+        "food", current_time=datetime(2024, 1, 1, 19), location="Juhu Beach"
+    )]
+    assert "Local Favorite at Juhu Beach" in food_titles
+
+
+def test_slang_questions_are_answered_with_the_meaning():
+    """Asking what a slang word means gets its meaning, not a translated query"""
+    system = LocalGuideSystem(PRODUCT_MD)
+    noon = datetime(2024, 1, 1, 12)
+
+    cutting = system.process_query("What does cutting mean?", noon)
+    assert "'cutting' means 'Half cup of tea'" in cutting.response_text
+
+    bindaas = system.process_query("What does bindaas mean?", noon)
+    assert "'bindaas' means 'Carefree/cool'" in bindaas.response_text
+
+    # 'Creative solution/hack' contains 'eat', which must not turn this into a food question
+    jugaad = system.process_query("What is the meaning of jugaad?", noon)
+    assert "Creative" not in jugaad.response_text
+    assert not jugaad.recommendations
+
+
+def test_mixed_language_words_are_reported_once():
+    """Words the slang dictionary translated are not listed again as mixed-language words"""
+    system = LocalGuideSystem(PRODUCT_MD)
+
+    translation = system.slang_interpreter.interpret_mixed_language("Bhai, kya scene hai?")
+
+    words = [word for word, _ in translation.slang_words_found]
+    assert sorted(words) == ['bhai', 'hai', 'kya', 'scene']
+    assert ('hai', 'brother/friend') not in translation.slang_words_found
+
+
+
+def test_cached_reasoning_results_are_not_shared():
+    """Mutating a reasoning result must not leak into later results for the same query"""
+    system = LocalGuideSystem(PRODUCT_MD)
+    engine = system.reasoning_engine
+    query = "Where can I eat street food in the evening?"
+    evening = datetime(2024, 1, 1, 18)
+
+    first = engine.process_query(query, evening)
+    expected = engine.process_query(query, evening)
+    first.sources_used.append("mutated")
+    first.query_analysis['keywords'].append("mutated")
+    first.query_analysis['intent'] = "mutated"
+
+    second = engine.process_query(query, evening)
+    second.reasoning_chain.clear()
+
+    third = engine.process_query(query, evening)
+    assert third == expected
+    assert "mutated" not in third.sources_used
+
+
+
+def test_post_7pm_traffic_pattern_is_applied():
+    """product.md says "After 7 PM roads are jammed"; the flag is matched case-insensitively"""
+    system = LocalGuideSystem(PRODUCT_MD)
+
+    result = system.reasoning_engine.process_query("Should I take an auto to Juhu?", datetime(2024, 1, 1, 19))
+
+    assert "Roads are typically jammed after 7 PM" in result.response
+    assert "Applied local timing pattern: post-7PM traffic" in result.reasoning_chain
+
+
+
+def test_confidence_score_without_missing_tags():
+    """ConfidenceScore can still be built from its original fields"""
+    score = ConfidenceScore(
+        overall_score=0.5,
+        level=ConfidenceLevel.MEDIUM,
+        factors={},
+        missing_information=[],
+        recommendation="",
+        should_ask_clarification=False
+    )
+
+    assert score.missing_tags == frozenset()
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__]))
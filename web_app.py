@@ -4,16 +4,42 @@ Web Interface for The Local Guide System
 Interactive UI/UX with real-time chat interface
 """
 
-from flask import Flask, render_template, request, jsonify, session
+from flask import Flask, Response, render_template, request, jsonify, session
+from collections import OrderedDict, deque
 from datetime import datetime
 import json
+import threading
 import uuid
 
 from src.local_guide_system import LocalGuideSystem
+from src.confidence_scorer import ConfidenceLevel
+
+# Fixed error messages, encoded once in the same compact form jsonify produces
+_ERROR_BODIES = {
+    message: json.dumps({'error': message}, separators=(',', ':')).encode() + b'\n'
+    for message in ('Empty message', 'Empty text', 'Empty query', 'Request too large')
+}
+
+# Chat history is kept server-side, keyed by session id, so the session cookie
+# only carries the id instead of re-signing the whole history on every message.
+# Holds the last _HISTORY_LENGTH messages for up to _MAX_SESSIONS recent sessions.
+_HISTORY_LENGTH = 20
+_MAX_SESSIONS = 1024
+_chat_histories: "OrderedDict[str, deque]" = OrderedDict()
+# Request threads share the store; held for every access to it or to a history in it
+_chat_histories_lock = threading.Lock()
 
 app = Flask(__name__)
 app.secret_key = 'local_guide_secret_key_2024'
 
+# Serialize JSON responses as-is: no key sorting, and no pretty-printing
+# even when running with debug=True
+app.json.sort_keys = False
+app.json.compact = True
+
+# Reject oversized request bodies (413) before they are read or parsed
+app.config['MAX_CONTENT_LENGTH'] = 16 * 1024
+
 # Initialize the Local Guide System
 guide_system = LocalGuideSystem()
 
@@ -21,9 +47,7 @@ guide_system = LocalGuideSystem()
 def index():
     """Main chat interface"""
     # Initialize session if new user
-    if 'session_id' not in session:
-        session['session_id'] = str(uuid.uuid4())
-        session['chat_history'] = []
+    _get_chat_history()
     
     # Get system status
     status = guide_system.get_system_status()
@@ -37,11 +61,15 @@ def index():
 def chat():
     """Process chat messages"""
     try:
+        rejected = _check_body_length('message', 'Empty message')
+        if rejected:
+            return rejected
+        
         data = request.get_json()
         user_message = data.get('message', '').strip()
         
         if not user_message:
-            return jsonify({'error': 'Empty message'}), 400
+            return _error_response('Empty message', 400)
         
         # Process the query
         current_time = datetime.now()
@@ -52,7 +80,7 @@ def chat():
             'response': response.response_text,
             'confidence': {
                 'score': round(response.confidence_score.overall_score, 2),
-                'level': response.confidence_score.level.value if hasattr(response.confidence_score.level, 'value') else str(response.confidence_score.level),
+                'level': response.confidence_score.level.label,
                 'emoji': get_confidence_emoji(response.confidence_score.overall_score)
             },
             'slang_translation': None,
@@ -83,19 +111,14 @@ def chat():
                 for rec in response.recommendations[:3]  # Limit to 3 recommendations
             ]
         
-        # Store in session history
-        if 'chat_history' not in session:
-            session['chat_history'] = []
-        
-        session['chat_history'].append({
-            'user': user_message,
-            'bot': chat_response,
-            'timestamp': current_time.isoformat()
-        })
-        
-        # Keep only last 20 messages
-        session['chat_history'] = session['chat_history'][-20:]
-        session.modified = True
+        # Store in session history (the deque keeps only the last 20 messages)
+        history = _get_chat_history()
+        with _chat_histories_lock:
+            history.append({
+                'user': user_message,
+                'bot': chat_response,
+                'timestamp': current_time.isoformat()
+            })
         
         return jsonify(chat_response)
         
@@ -106,12 +129,16 @@ def chat():
 def translate():
     """Translate slang text"""
     try:
+        rejected = _check_body_length('text', 'Empty text')
+        if rejected:
+            return rejected
+        
         data = request.get_json()
         text = data.get('text', '').strip()
         direction = data.get('direction', 'to_standard')  # to_standard or to_local
         
         if not text:
-            return jsonify({'error': 'Empty text'}), 400
+            return _error_response('Empty text', 400)
         
         translation = guide_system.translate_slang(text, direction)
         
@@ -135,13 +162,14 @@ def get_recommendations(rec_type):
         location = request.args.get('location')
         budget = request.args.get('budget')
         weather = request.args.get('weather')
+        current_time = datetime.now()
         
         recommendations = guide_system.get_recommendations(
             rec_type,
             location=location,
             budget_level=budget,
             weather_condition=weather,
-            current_time=datetime.now()
+            current_time=current_time
         )
         
         return jsonify([
@@ -171,11 +199,15 @@ def system_status():
 def debug_query():
     """Debug query processing"""
     try:
+        rejected = _check_body_length('query', 'Empty query')
+        if rejected:
+            return rejected
+        
         data = request.get_json()
         query = data.get('query', '').strip()
         
         if not query:
-            return jsonify({'error': 'Empty query'}), 400
+            return _error_response('Empty query', 400)
         
         debug_info = guide_system.debug_query_processing(query)
         return jsonify(debug_info)
@@ -186,27 +218,60 @@ def debug_query():
 @app.route('/history')
 def chat_history():
     """Get chat history"""
-    return jsonify(session.get('chat_history', []))
+    history = _get_chat_history()
+    with _chat_histories_lock:
+        entries = list(history)
+    return jsonify(entries)
 
 @app.route('/clear_history', methods=['POST'])
 def clear_history():
     """Clear chat history"""
-    session['chat_history'] = []
-    session.modified = True
+    history = _get_chat_history()
+    with _chat_histories_lock:
+        history.clear()
     return jsonify({'success': True})
 
+def _error_response(message: str, status: int) -> Response:
+    """JSON error response for one of the fixed messages in _ERROR_BODIES"""
+    return Response(_ERROR_BODIES[message], status=status, mimetype='application/json')
+
+def _check_body_length(key: str, empty_error: str):
+    """Error response for a body too large, or too short to hold a non-empty string for key.
+    
+    The shortest useful body is {"key":"x"}, so these requests are rejected
+    from the Content-Length alone, without reading or parsing the JSON.
+    """
+    length = request.content_length
+    if length is None:
+        return None
+    if length > app.config['MAX_CONTENT_LENGTH']:
+        return _error_response('Request too large', 413)
+    if length < len(key) + 8:
+        return _error_response(empty_error, 400)
+    return None
+
+def _get_chat_history() -> deque:
+    """Chat history for the current session, starting a new session if needed"""
+    if 'session_id' not in session:
+        session['session_id'] = str(uuid.uuid4())
+    if 'chat_history' in session:
+        # History stored in the cookie by earlier versions
+        del session['chat_history']
+    
+    session_id = session['session_id']
+    with _chat_histories_lock:
+        history = _chat_histories.get(session_id)
+        if history is None:
+            history = _chat_histories[session_id] = deque(maxlen=_HISTORY_LENGTH)
+            if len(_chat_histories) > _MAX_SESSIONS:
+                _chat_histories.popitem(last=False)
+        else:
+            _chat_histories.move_to_end(session_id)
+    return history
+
 def get_confidence_emoji(score):
     """Get emoji for confidence score"""
-    if score >= 0.8:
-        return "🟢"
-    elif score >= 0.6:
-        return "🟢"
-    elif score >= 0.4:
-        return "🟡"
-    elif score >= 0.2:
-        return "🟠"
-    else:
-        return "🔴"
+    return ConfidenceLevel.from_score(score).emoji
 
 if __name__ == '__main__':
     print("🌍 Starting The Local Guide System Web Interface...")